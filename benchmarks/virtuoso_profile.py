@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+"""
+Compare the generic and Virtuoso endpoint profiles of the triplestore uploader.
+
+Generates a folder of synthetic INSERT DATA files, uploads it once per profile
+and prints the wall-clock time of each run. The target graph is cleared before
+every run, so point it at a disposable endpoint, e.g. the test container:
+
+    python benchmarks/virtuoso_profile.py http://localhost:28890/sparql --files 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+from sparqlite import SPARQLClient
+
+from piccione.upload.on_triplestore import ENDPOINT_PROFILES, upload_sparql_updates
+
+console = Console()
+
+GRAPH = "http://example.org/piccione-benchmark"
+
+
+def generate_files(folder: Path, files: int, triples: int) -> None:
+    for i in range(files):
+        body = "\n".join(
+            f'<http://example.org/s{i}> <http://example.org/p{j}> "value {i} {j}" .' for j in range(triples)
+        )
+        (folder / f"update_{i:06d}.sparql").write_text(f"INSERT DATA {{ GRAPH <{GRAPH}> {{\n{body}\n}} }}")
+
+
+def run_profile(endpoint: str, folder: Path, profile: str, batch_size: int | None) -> float:
+    with SPARQLClient(endpoint) as client:
+        client.update(f"CLEAR SILENT GRAPH <{GRAPH}>")
+    start = time.perf_counter()
+    upload_sparql_updates(
+        endpoint,
+        folder,
+        failed_file=folder.parent / f"failed_{profile}.txt",
+        stop_file=folder.parent / ".stop_benchmark",
+        show_progress=False,
+        profile=profile,
+        batch_size=batch_size,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark triplestore uploader endpoint profiles.")
+    parser.add_argument("endpoint", type=str, help="SPARQL endpoint URL of a disposable Virtuoso instance")
+    parser.add_argument("--files", type=int, default=1000, help="Number of update files (default: 1000)")
+    parser.add_argument("--triples", type=int, default=50, help="Triples per file (default: 50)")
+    parser.add_argument("--batch_size", type=int, help="Override the profile batch size")
+    args = parser.parse_args()
+
+    table = Table("Profile", "Batch size", "Seconds", "Files/s")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(temp_dir) / "updates"
+        folder.mkdir()
+        generate_files(folder, args.files, args.triples)
+        for profile in ("generic", "virtuoso"):
+            elapsed = run_profile(args.endpoint, folder, profile, args.batch_size)
+            batch_size = args.batch_size or ENDPOINT_PROFILES[profile].batch_size
+            table.add_row(profile, str(batch_size), f"{elapsed:.2f}", f"{args.files / elapsed:.1f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,7 @@ export default defineConfig({
 					items: [
 						{ label: 'Figshare', slug: 'download/figshare' },
 						{ label: 'SharePoint', slug: 'download/sharepoint' },
+						{ label: 'Mirror verification', slug: 'download/verify' },
 					],
 				},
 			],
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import TypedDict
+
+CHUNK_SIZE = 1048576
+
+
+class DigestRecord(TypedDict):
+    inode: int
+    size: int
+    mtime_ns: int
+    md5: str
+
+
+def compute_md5(file_path: str | Path, chunk_size: int = CHUNK_SIZE) -> tuple[str, int]:
+    with Path(file_path).open("rb") as fin:
+        md5 = hashlib.md5(usedforsecurity=False)
+        size = 0
+        data = fin.read(chunk_size)
+        while data:
+            size += len(data)
+            md5.update(data)
+            data = fin.read(chunk_size)
+        return md5.hexdigest(), size
+
+
+class DigestCache:
+    """
+    MD5 digests of local files, reused as long as a file keeps the same
+    inode, size and modification time.
+
+    Without a path the cache only lives for the current run; with a path it is
+    loaded from and saved to a JSON file, so unchanged files are never hashed
+    again across runs.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._records: dict[str, DigestRecord] = {}
+        self._lock = threading.Lock()
+        self._file_locks: dict[str, threading.Lock] = {}
+        self._dirty = False
+        if self.path is not None and self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self._records = json.load(f)
+
+    def get(self, file_path: str | Path) -> tuple[str, int]:
+        key = str(Path(file_path).absolute())
+        with self._lock:
+            file_lock = self._file_locks.setdefault(key, threading.Lock())
+        # Concurrent lookups of the same file wait for a single computation.
+        with file_lock:
+            stat = Path(file_path).stat()
+            with self._lock:
+                record = self._records.get(key)
+            if (
+                record is not None
+                and record["inode"] == stat.st_ino
+                and record["size"] == stat.st_size
+                and record["mtime_ns"] == stat.st_mtime_ns
+            ):
+                return record["md5"], record["size"]
+
+            md5, size = compute_md5(file_path)
+            with self._lock:
+                self._records[key] = {"inode": stat.st_ino, "size": size, "mtime_ns": stat.st_mtime_ns, "md5": md5}
+                self._dirty = True
+            return md5, size
+
+    def record(self, file_path: str | Path, md5: str) -> None:
+        stat = Path(file_path).stat()
+        with self._lock:
+            self._records[str(Path(file_path).absolute())] = {
+                "inode": stat.st_ino,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "md5": md5,
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(self._records, f)
+            tmp_path.replace(self.path)
+            self._dirty = False
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+"""
+Unpack archives while they are downloaded.
+
+Tar archives, compressed or not, are read as a stream: members are written
+to disk as the bytes arrive and the archive itself is never stored. Zip
+archives keep their directory at the end, so they are read through HTTP
+Range requests instead, member by member in file order. In both cases the
+MD5 is computed over the archive bytes, as published.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import tarfile
+import zipfile
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import requests
+    from _typeshed import WriteableBuffer
+
+READ_SIZE = 1048576
+SKIP_LIMIT = 1048576
+HTTP_PARTIAL_CONTENT = 206
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_SUFFIXES = (".zip",)
+
+
+class Progress(Protocol):
+    def update(self, n: int) -> object: ...
+
+
+def archive_kind(name: str) -> str | None:
+    lowered = name.lower()
+    if lowered.endswith(TAR_SUFFIXES):
+        return "tar"
+    if lowered.endswith(ZIP_SUFFIXES):
+        return "zip"
+    return None
+
+
+def extraction_dir(output_path: Path) -> Path:
+    name = output_path.name
+    for suffix in (*TAR_SUFFIXES, *ZIP_SUFFIXES):
+        if name.lower().endswith(suffix):
+            return output_path.with_name(name[: -len(suffix)])
+    return output_path
+
+
+class HashingReader(io.RawIOBase):
+    def __init__(self, source: io.RawIOBase, progress: Progress) -> None:
+        self.source = source
+        self.progress = progress
+        self.md5 = hashlib.md5(usedforsecurity=False)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        length = self.source.readinto(buffer) or 0
+        self.md5.update(memoryview(buffer)[:length])
+        self.progress.update(length)
+        return length
+
+    def drain(self) -> str:
+        buffer = bytearray(READ_SIZE)
+        while self.readinto(buffer):
+            pass
+        return self.md5.hexdigest()
+
+
+def extract_tar_stream(response: requests.Response, destination: Path, progress: Progress) -> str:
+    # Without extraction filters a crafted archive could write outside the destination.
+    if not hasattr(tarfile, "data_filter"):  # pragma: no cover
+        msg = "Extracting tar archives requires a Python release with tarfile extraction filters (3.10.12 or later)"
+        raise RuntimeError(msg)
+    response.raw.decode_content = True
+    reader = HashingReader(response.raw, progress)
+    with tarfile.open(fileobj=io.BufferedReader(reader, READ_SIZE), mode="r|*") as archive:
+        archive.extractall(destination, filter="data")
+    # The end-of-archive padding is not read by tarfile, but it is part of the published bytes.
+    return reader.drain()
+
+
+class RangeReader(io.RawIOBase):
+    """Seekable view of a remote file that reuses one ranged stream for as long as reads are sequential."""
+
+    def __init__(self, get: Callable[..., requests.Response], url: str, size: int, progress: Progress) -> None:
+        self.get = get
+        self.url = url
+        self.size = size
+        self.progress = progress
+        self.md5 = hashlib.md5(usedforsecurity=False)
+        self.hashed = 0
+        self._position = 0
+        self._response: requests.Response | None = None
+        self._stream_position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self.size}[whence]
+        self._position = max(0, min(self.size, base + offset))
+        return self._position
+
+    def _open(self, start: int) -> requests.Response:
+        self._close_response()
+        response = self.get(self.url, headers={"Range": f"bytes={start}-"}, stream=True, timeout=(30, 300))
+        response.raise_for_status()
+        if response.status_code != HTTP_PARTIAL_CONTENT:
+            response.close()
+            msg = f"Range request from byte {start} was not honoured (HTTP {response.status_code})"
+            raise ValueError(msg)
+        self._response = response
+        self._stream_position = start
+        return response
+
+    def _pull(self, response: requests.Response, buffer: memoryview) -> int:
+        length = response.raw.readinto(buffer) or 0
+        if not length:
+            msg = f"Stream ended early at byte {self._stream_position}"
+            raise ValueError(msg)
+        # Bytes are hashed only when they extend the contiguous prefix, so the digest covers the file in order.
+        if self._stream_position == self.hashed:
+            self.md5.update(buffer[:length])
+            self.hashed += length
+            self.progress.update(length)
+        self._stream_position += length
+        return length
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        view = memoryview(buffer)[: max(0, self.size - self._position)]
+        if not len(view):
+            return 0
+        response = self._response
+        if response is None or not 0 <= self._position - self._stream_position <= SKIP_LIMIT:
+            response = self._open(self._position)
+        # Short forward jumps, such as data descriptors between members, are read through rather than reopened.
+        if self._stream_position < self._position:
+            scratch = memoryview(bytearray(SKIP_LIMIT))
+            while self._stream_position < self._position:
+                self._pull(response, scratch[: self._position - self._stream_position])
+        length = self._pull(response, view)
+        self._position += length
+        return length
+
+    def finish(self) -> str:
+        # Whatever was skipped or read out of order, typically the central directory, is hashed last.
+        buffer = bytearray(READ_SIZE)
+        self.seek(self.hashed)
+        while self.hashed < self.size:
+            self.readinto(buffer)
+        return self.md5.hexdigest()
+
+    def _close_response(self) -> None:
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def close(self) -> None:
+        self._close_response()
+        super().close()
+
+
+def extract_members(archive: zipfile.ZipFile, destination: Path) -> None:
+    # Members are visited in file order, so the ranged stream moves forward through the archive.
+    for info in sorted(archive.infolist(), key=lambda info: info.header_offset):
+        archive.extract(info, destination)
+
+
+def extract_zip_ranges(
+    get: Callable[..., requests.Response],
+    url: str,
+    size: int,
+    destination: Path,
+    progress: Progress,
+) -> str:
+    with RangeReader(get, url, size, progress) as reader:
+        with zipfile.ZipFile(io.BufferedReader(reader, READ_SIZE)) as archive:
+            extract_members(archive, destination)
+        return reader.finish()
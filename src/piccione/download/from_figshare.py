@@ -15,77 +15,685 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import json
+import os
+import queue
+import shutil
 import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
 import requests
+from requests.adapters import HTTPAdapter
 from rich.console import Console
 from tqdm import tqdm
 
+from piccione.digest_cache import DigestCache, compute_md5
+from piccione.download.extract import (
+    archive_kind,
+    extract_members,
+    extract_tar_stream,
+    extract_zip_ranges,
+    extraction_dir,
+)
+from piccione.download.metadata_cache import MetadataCache
+from piccione.pagination import iter_windowed_pages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable, Iterator
+    from concurrent.futures import Future
+
 console = Console()
 
 BASE_URL = "https://api.figshare.com/v2"
-CHUNK_SIZE = 8192
+BUFFER_SIZE = 1048576
+BUFFER_COUNT = 4
+PROGRESS_INTERVAL = 0.1
+DOWNLOAD_WORKERS = 4
+LISTING_WORKERS = 4
+FILES_PAGE_SIZE = 1000
+SEGMENTS = 4
+SEGMENT_THRESHOLD = 67108864
+RANGE_SIZE = 67108864
+DIGEST_CACHE_NAME = ".figshare-digests.json"
+METADATA_CACHE_NAME = ".figshare-metadata.json"
+MANIFEST_NAME = ".figshare-manifest.json"
+HTTP_PARTIAL_CONTENT = 206
 
 
 class FigshareFileEntry(TypedDict):
+    id: int
     name: str
     size: int
     download_url: str
     supplied_md5: str | None
 
 
+class MirrorEntry(TypedDict):
+    id: int
+    size: int
+    md5: str | None
+
+
 class FigshareArticleMetadata(TypedDict):
     files: list[FigshareFileEntry]
 
 
-def get_article_metadata(article_id: int) -> FigshareArticleMetadata:
-    url = f"{BASE_URL}/articles/{article_id}"
-    response = requests.get(url, timeout=30)
+class FigshareArticleEntry(TypedDict):
+    id: int
+    title: str
+
+
+def get_json(url: str, params: dict[str, int] | None = None, cache: MetadataCache | None = None) -> Any:  # noqa: ANN401
+    if cache is not None:
+        return cache.get_json(url, params)
+    response = requests.get(url, params=params, timeout=30)
     response.raise_for_status()
-    article_data = response.json()
+    return response.json()
+
+
+def get_page(url: str, page: int, cache: MetadataCache | None = None) -> list[Any]:
+    return get_json(url, {"page": page, "page_size": FILES_PAGE_SIZE}, cache)
+
+
+def iter_pages(url: str, workers: int = LISTING_WORKERS, cache: MetadataCache | None = None) -> Iterator[Any]:
+    return iter_windowed_pages(lambda page: get_page(url, page, cache), FILES_PAGE_SIZE, workers)
+
+
+def iter_article_files(
+    article_id: int,
+    workers: int = LISTING_WORKERS,
+    cache: MetadataCache | None = None,
+) -> Iterator[FigshareFileEntry]:
+    return iter_pages(f"{BASE_URL}/articles/{article_id}/files", workers, cache)
+
+
+def iter_group_files(
+    group: str,
+    group_id: int,
+    workers: int = LISTING_WORKERS,
+    cache: MetadataCache | None = None,
+) -> Iterator[FigshareFileEntry]:
+    def list_article(article: FigshareArticleEntry) -> list[FigshareFileEntry]:
+        # Each article gets its own subdirectory, named after its ID, so equal file names do not collide.
+        return [
+            {**f, "name": f"{article['id']}/{f['name']}"} for f in iter_article_files(article["id"], workers, cache)
+        ]
+
+    articles: Iterator[FigshareArticleEntry] = iter_pages(
+        f"{BASE_URL}/{group}/{group_id}/articles",
+        workers,
+        cache,
+    )
+    pending: set[Future[list[FigshareFileEntry]]] = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for article in articles:
+            pending.add(executor.submit(list_article, article))
+            # Listings that are already complete are handed on while articles are still being enumerated.
+            done = {future for future in pending if future.done()}
+            pending -= done
+            for future in done:
+                yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def get_article_metadata(article_id: int, cache: MetadataCache | None = None) -> FigshareArticleMetadata:
+    article_data = get_json(f"{BASE_URL}/articles/{article_id}", cache=cache)
 
     # Figshare API has a default limit of 10 files. We need to fetch files separately with pagination.
-    files_url = f"{BASE_URL}/articles/{article_id}/files"
-    files_response = requests.get(files_url, params={"page_size": 1000}, timeout=30)
-    files_response.raise_for_status()
-    article_data["files"] = files_response.json()
+    article_data["files"] = list(iter_article_files(article_id, cache=cache))
 
     return article_data
 
 
+@dataclass
+class DownloadSummary:
+    downloaded: int = 0
+    bytes_downloaded: int = 0
+    skipped: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+    failed: list[str] = field(default_factory=list)
+
+
+def create_session(pool_size: int = DOWNLOAD_WORKERS) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ThrottledProgress:
+    """Batch progress updates so that the bar is refreshed at most once per interval."""
+
+    def __init__(self, bar: tqdm, interval: float = PROGRESS_INTERVAL) -> None:
+        self.bar = bar
+        self.interval = interval
+        self._pending = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, n: int) -> None:
+        with self._lock:
+            self._pending += n
+            now = time.monotonic()
+            if now - self._last < self.interval:
+                return
+            pending, self._pending, self._last = self._pending, 0, now
+        self.bar.update(pending)
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, 0
+        if pending:
+            self.bar.update(pending)
+
+
+def pipe_response(
+    response: requests.Response,
+    sink: Callable[[memoryview], object],
+    buffer_size: int = BUFFER_SIZE,
+    buffers: int = BUFFER_COUNT,
+) -> None:
+    # The socket is read into a fixed pool of buffers while another thread writes and hashes the filled ones,
+    # so network reads never wait on the disk. The pool size bounds the data in flight.
+    free: queue.Queue[bytearray] = queue.Queue()
+    for _ in range(buffers):
+        free.put(bytearray(buffer_size))
+    filled: queue.Queue[tuple[bytearray, int] | None] = queue.Queue()
+    failed = threading.Event()
+
+    def consume() -> None:
+        error: Exception | None = None
+        while (item := filled.get()) is not None:
+            buffer, length = item
+            if error is None:
+                try:
+                    sink(memoryview(buffer)[:length])
+                except Exception as e:  # noqa: BLE001
+                    error = e
+                    failed.set()
+            # Buffers keep flowing back after a failure so the reader is never left waiting.
+            free.put(buffer)
+        if error is not None:
+            raise error
+
+    response.raw.decode_content = True
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        writer = executor.submit(consume)
+        try:
+            while not failed.is_set():
+                buffer = free.get()
+                length = response.raw.readinto(buffer)
+                if not length:
+                    break
+                filled.put((buffer, length))
+        finally:
+            filled.put(None)
+        writer.result()
+
+
+def supports_ranges(get: Callable[..., requests.Response], download_url: str, expected_size: int) -> bool:
+    response = get(download_url, headers={"Range": "bytes=0-0"}, stream=True, timeout=(30, 300))
+    with response:
+        if response.status_code != HTTP_PARTIAL_CONTENT:
+            return False
+        content_range = response.headers.get("Content-Range", "")
+        return content_range.rpartition("/")[2] == str(expected_size)
+
+
+def download_range(
+    get: Callable[..., requests.Response],
+    download_url: str,
+    fd: int,
+    start: int,
+    end: int,
+    progress: ThrottledProgress,
+) -> None:
+    offset = start
+
+    def write(block: memoryview) -> None:
+        nonlocal offset
+        if offset + len(block) > end + 1:
+            msg = f"Range {start}-{end} returned more data than requested"
+            raise ValueError(msg)
+        os.pwrite(fd, block, offset)
+        offset += len(block)
+        progress.update(len(block))
+
+    response = get(download_url, headers={"Range": f"bytes={start}-{end}"}, stream=True, timeout=(30, 300))
+    with response:
+        response.raise_for_status()
+        if response.status_code != HTTP_PARTIAL_CONTENT:
+            msg = f"Range {start}-{end} was not honoured (HTTP {response.status_code})"
+            raise ValueError(msg)
+        pipe_response(response, write)
+    if offset != end + 1:
+        msg = f"Range {start}-{end} ended early at byte {offset}"
+        raise ValueError(msg)
+
+
+def part_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.name}.part")
+
+
+def ranges_path(part: Path) -> Path:
+    return part.with_name(f"{part.name}.ranges")
+
+
+def download_segments(
+    get: Callable[..., requests.Response],
+    download_url: str,
+    part: Path,
+    size: int,
+    segments: int,
+    progress: ThrottledProgress,
+) -> None:
+    range_size = min(RANGE_SIZE, -(-size // segments))
+    ranges = [(start, min(start + range_size, size) - 1) for start in range(0, size, range_size)]
+    state_path = ranges_path(part)
+    if state_path.exists():
+        with state_path.open(encoding="utf-8") as f:
+            done = set(json.load(f))
+    else:
+        # A partial file left by a single-stream download is a valid prefix.
+        existing_size = part.stat().st_size if part.exists() else 0
+        done = {start for start, end in ranges if end < existing_size}
+    lock = threading.Lock()
+
+    def save_state() -> None:
+        tmp_path = state_path.with_name(f"{state_path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(sorted(done), f)
+        tmp_path.replace(state_path)
+
+    def fetch(start: int, end: int) -> None:
+        download_range(get, download_url, fd, start, end, progress)
+        with lock:
+            done.add(start)
+            save_state()
+
+    # The state is written before the file is preallocated, so a full-size part is never mistaken for a finished one.
+    save_state()
+    progress.update(sum(end - start + 1 for start, end in ranges if start in done))
+    fd = os.open(part, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            futures = [executor.submit(fetch, start, end) for start, end in ranges if start not in done]
+            for future in as_completed(futures):
+                future.result()
+    finally:
+        os.close(fd)
+    state_path.unlink()
+
+
+def download_stream(
+    get: Callable[..., requests.Response],
+    download_url: str,
+    part: Path,
+    expected_size: int,
+    progress: ThrottledProgress,
+) -> str:
+    state_path = ranges_path(part)
+    if state_path.exists():
+        # A preallocated part from a segmented download has holes and cannot be appended to.
+        part.unlink(missing_ok=True)
+        state_path.unlink()
+    offset = part.stat().st_size if part.exists() else 0
+    if part.exists() and offset == expected_size:
+        progress.update(offset)
+        return compute_md5(part)[0]
+
+    resume = 0 < offset < expected_size
+    headers = {"Range": f"bytes={offset}-"} if resume else {}
+    response = get(download_url, headers=headers, stream=True, timeout=(30, 300))
+    response.raise_for_status()
+
+    md5_hash = hashlib.md5(usedforsecurity=False)
+    mode = "wb"
+    if resume and response.status_code == HTTP_PARTIAL_CONTENT:
+        # The bytes already on disk are hashed before the rest is appended.
+        with part.open("rb") as f:
+            while data := f.read(BUFFER_SIZE):
+                md5_hash.update(data)
+        progress.update(offset)
+        mode = "ab"
+    with part.open(mode) as f:
+
+        def write(block: memoryview) -> None:
+            f.write(block)
+            md5_hash.update(block)
+            progress.update(len(block))
+
+        pipe_response(response, write)
+    return md5_hash.hexdigest()
+
+
 def download_file(
     download_url: str,
     output_path: str | Path,
     expected_size: int,
     expected_md5: str | None = None,
-) -> None:
-    response = requests.get(download_url, stream=True, timeout=(30, 300))
-    response.raise_for_status()
+    *,
+    session: requests.Session | None = None,
+    progress: tqdm | None = None,
+    segments: int = SEGMENTS,
+) -> str | None:
+    get = session.get if session is not None else requests.get
+    output_path = Path(output_path)
+    part = part_path(output_path)
+    # A shared progress bar is owned by the caller; otherwise each file gets its own.
+    bar = (
+        nullcontext(progress)
+        if progress is not None
+        else tqdm(total=expected_size, unit="B", unit_scale=True, unit_divisor=1024)
+    )
 
-    md5_hash = hashlib.md5(usedforsecurity=False)
+    with bar as pbar:
+        throttled = ThrottledProgress(pbar)
+        try:
+            # Large files are fetched over several connections when the server honours Range requests.
+            if (
+                segments > 1
+                and expected_size >= SEGMENT_THRESHOLD
+                and supports_ranges(get, download_url, expected_size)
+            ):
+                download_segments(get, download_url, part, expected_size, segments, throttled)
+                actual_md5 = compute_md5(part)[0] if expected_md5 else None
+            else:
+                actual_md5 = download_stream(get, download_url, part, expected_size, throttled)
+        finally:
+            throttled.flush()
 
-    with (
-        Path(output_path).open("wb") as f,
-        tqdm(total=expected_size, unit="B", unit_scale=True, unit_divisor=1024) as pbar,
-    ):
-        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
-            f.write(chunk)
-            md5_hash.update(chunk)
-            pbar.update(len(chunk))
+    if expected_md5:
+        if actual_md5 != expected_md5:
+            part.unlink(missing_ok=True)
+            msg = f"MD5 mismatch: expected {expected_md5}, got {actual_md5}"
+            raise ValueError(msg)
+        console.print(f"  MD5 checksum verified: {actual_md5}")
+    part.replace(output_path)
+    return actual_md5
+
+
+def extract_file(
+    download_url: str,
+    output_path: str | Path,
+    expected_size: int,
+    expected_md5: str | None = None,
+    *,
+    session: requests.Session | None = None,
+    progress: tqdm | None = None,
+) -> str:
+    get = session.get if session is not None else requests.get
+    output_path = Path(output_path)
+    destination = extraction_dir(output_path)
+    # Members are unpacked into <name>.part and the directory is renamed once the archive MD5 is verified.
+    staging = part_path(destination)
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    bar = (
+        nullcontext(progress)
+        if progress is not None
+        else tqdm(total=expected_size, unit="B", unit_scale=True, unit_divisor=1024)
+    )
+
+    with bar as pbar:
+        throttled = ThrottledProgress(pbar)
+        try:
+            if archive_kind(output_path.name) != "zip":
+                response = get(download_url, stream=True, timeout=(30, 300))
+                with response:
+                    response.raise_for_status()
+                    actual_md5 = extract_tar_stream(response, staging, throttled)
+            elif supports_ranges(get, download_url, expected_size):
+                actual_md5 = extract_zip_ranges(get, download_url, expected_size, staging, throttled)
+            else:
+                # Without Range support the zip directory cannot be reached early, so the archive is stored first.
+                part = part_path(output_path)
+                actual_md5 = download_stream(get, download_url, part, expected_size, throttled)
+                with zipfile.ZipFile(part) as archive:
+                    extract_members(archive, staging)
+                part.unlink()
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        finally:
+            throttled.flush()
 
     if expected_md5:
-        actual_md5 = md5_hash.hexdigest()
         if actual_md5 != expected_md5:
+            shutil.rmtree(staging, ignore_errors=True)
             msg = f"MD5 mismatch: expected {expected_md5}, got {actual_md5}"
             raise ValueError(msg)
         console.print(f"  MD5 checksum verified: {actual_md5}")
+    shutil.rmtree(destination, ignore_errors=True)
+    staging.replace(destination)
+    return actual_md5
+
+
+def is_complete(output_path: Path, file_info: FigshareFileEntry, digests: DigestCache) -> bool:
+    if not output_path.is_file() or output_path.stat().st_size != file_info["size"]:
+        return False
+    # The size matches: the MD5 is only computed for files the digest cache does not know yet.
+    return not file_info["supplied_md5"] or digests.get(output_path)[0] == file_info["supplied_md5"]
+
+
+def fetch_file(  # noqa: PLR0913
+    file_info: FigshareFileEntry,
+    output_dir: Path,
+    session: requests.Session,
+    progress: tqdm,
+    segments: int,
+    digests: DigestCache,
+    *,
+    extract: bool = False,
+    force: bool = False,
+) -> bool:
+    output_path = output_dir / file_info["name"]
+    if extract and archive_kind(output_path.name):
+        # An extraction directory only appears once its archive has been verified. Its contents cannot be
+        # checked against the archive MD5, so a changed archive is fetched with force and replaces it.
+        if not force and extraction_dir(output_path).is_dir():
+            progress.update(file_info["size"])
+            return False
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        extract_file(
+            file_info["download_url"],
+            output_path,
+            file_info["size"],
+            file_info["supplied_md5"],
+            session=session,
+            progress=progress,
+        )
+        return True
+    if is_complete(output_path, file_info, digests):
+        progress.update(file_info["size"])
+        return False
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    md5 = download_file(
+        file_info["download_url"],
+        output_path,
+        file_info["size"],
+        file_info["supplied_md5"],
+        session=session,
+        progress=progress,
+        segments=segments,
+    )
+    if md5 is not None:
+        digests.record(output_path, md5)
+    return True
+
+
+def download_files(
+    files: Iterable[FigshareFileEntry],
+    output_dir: Path,
+    workers: int = DOWNLOAD_WORKERS,
+    segments: int = SEGMENTS,
+    *,
+    extract: bool = False,
+    refresh: Collection[str] = (),
+) -> DownloadSummary:
+    summary = DownloadSummary()
+    digests = DigestCache(output_dir / DIGEST_CACHE_NAME)
+    start = time.monotonic()
+    with (
+        create_session(workers * max(segments, 1)) as session,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+        tqdm(total=0, unit="B", unit_scale=True, unit_divisor=1024) as progress,
+    ):
+        # Files are submitted as the listing yields them, so downloads start while later pages are still arriving.
+        futures = {}
+        for f in files:
+            progress.total += f["size"]
+            progress.refresh()
+            future = executor.submit(
+                fetch_file,
+                f,
+                output_dir,
+                session,
+                progress,
+                segments,
+                digests,
+                extract=extract,
+                force=f["name"] in refresh,
+            )
+            futures[future] = f
+        for future in as_completed(futures):
+            file_info = futures[future]
+            try:
+                downloaded = future.result()
+            except Exception as e:  # noqa: BLE001
+                console.print(f"[red]Failed: {file_info['name']} ({e})")
+                summary.failed.append(file_info["name"])
+            else:
+                if downloaded:
+                    summary.downloaded += 1
+                    summary.bytes_downloaded += file_info["size"]
+                else:
+                    summary.skipped += 1
+    digests.save()
+    summary.seconds = time.monotonic() - start
+    return summary
+
+
+def mirror_entry(file_info: FigshareFileEntry) -> MirrorEntry:
+    return {"id": file_info["id"], "size": file_info["size"], "md5": file_info["supplied_md5"]}
+
+
+def local_copy(output_dir: Path, name: str, *, extract: bool) -> Path:
+    output_path = output_dir / name
+    return extraction_dir(output_path) if extract and archive_kind(name) else output_path
+
+
+def load_manifest(path: Path) -> dict[str, MirrorEntry]:
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path: Path, manifest: dict[str, MirrorEntry]) -> None:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def remove_unlisted(output_dir: Path, names: Iterable[str]) -> int:
+    removed = 0
+    for name in sorted(names):
+        output_path = output_dir / name
+        # The copy may have been stored as is or unpacked, and a download of it may have been interrupted.
+        paths = [output_path, part_path(output_path), ranges_path(part_path(output_path))]
+        if archive_kind(name):
+            paths.append(extraction_dir(output_path))
+        existing = [path for path in paths if path.exists()]
+        for path in existing:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        if existing:
+            removed += 1
+            console.print(f"[yellow]Removed: {name}")
+    return removed
+
+
+def sync_files(
+    files: Iterable[FigshareFileEntry],
+    output_dir: Path,
+    workers: int = DOWNLOAD_WORKERS,
+    segments: int = SEGMENTS,
+    *,
+    extract: bool = False,
+    delete: bool = False,
+) -> DownloadSummary:
+    manifest_path = output_dir / MANIFEST_NAME
+    previous = load_manifest(manifest_path)
+    listed: dict[str, FigshareFileEntry] = {}
+    unchanged: list[str] = []
+    stale: set[str] = set()
+
+    def changed() -> Iterator[FigshareFileEntry]:
+        # A file whose id, size and MD5 match the manifest is left alone: it is neither hashed nor looked up.
+        for f in files:
+            listed[f["name"]] = f
+            copy = local_copy(output_dir, f["name"], extract=extract)
+            entry = previous.get(f["name"])
+            if entry == mirror_entry(f) and copy.exists():
+                unchanged.append(f["name"])
+                continue
+            if entry is not None and entry != mirror_entry(f):
+                stale.add(f["name"])
+            yield f
+
+    summary = download_files(changed(), output_dir, workers, segments, extract=extract, refresh=stale)
+    summary.skipped += len(unchanged)
+    failed = set(summary.failed)
+    # Entries of files that failed or are no longer listed are kept, so that a later --delete still knows them.
+    manifest = {name: entry for name, entry in previous.items() if name not in listed or name in failed}
+    manifest.update((name, mirror_entry(f)) for name, f in listed.items() if name not in failed)
+    if delete:
+        # Only files recorded by a previous sync are removed, never anything else in the output directory.
+        unlisted = previous.keys() - listed.keys()
+        summary.removed = remove_unlisted(output_dir, unlisted)
+        for name in unlisted:
+            del manifest[name]
+    save_manifest(manifest_path, manifest)
+    return summary
 
 
 def main() -> int:  # pragma: no cover
-    parser = argparse.ArgumentParser(description="Download files from a Figshare article")
-    parser.add_argument("article_id", type=int, help="Figshare article ID")
+    parser = argparse.ArgumentParser(description="Download files from a Figshare article, collection or project")
+    parser.add_argument(
+        "article_id",
+        type=int,
+        help="Figshare article ID, or collection or project ID with --collection or --project",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--collection",
+        action="store_const",
+        const="collections",
+        dest="group",
+        help="Download every article of a collection, each into a subdirectory named after its ID",
+    )
+    group.add_argument(
+        "--project",
+        action="store_const",
+        const="projects",
+        dest="group",
+        help="Download every article of a project, each into a subdirectory named after its ID",
+    )
     parser.add_argument(
         "-o",
         "--output-dir",
@@ -93,38 +701,93 @@ def main() -> int:  # pragma: no cover
         default=Path(),
         help="Output directory for downloaded files (default: current directory)",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=f"Number of files downloaded concurrently (default: {DOWNLOAD_WORKERS})",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--segments",
+        type=int,
+        default=SEGMENTS,
+        help=f"Parallel connections per file of at least 64 MB, 1 to disable (default: {SEGMENTS})",
+    )
+    parser.add_argument(
+        "-x",
+        "--extract",
+        action="store_true",
+        help="Unpack tar and zip archives while they download instead of storing them",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help=f"Keep the output directory in sync using a manifest in {MANIFEST_NAME}: unchanged files are not checked",
+    )
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="With --sync, remove local copies of files that a previous sync recorded and are no longer listed",
+    )
+    parser.add_argument(
+        "--metadata-ttl",
+        type=float,
+        default=0,
+        help="Seconds during which cached API responses are reused without revalidation (default: 0)",
+    )
+    parser.add_argument(
+        "-l",
+        "--listing-workers",
+        type=int,
+        default=LISTING_WORKERS,
+        help=f"Number of concurrent listing requests for pages and articles (default: {LISTING_WORKERS})",
+    )
 
     args = parser.parse_args()
+    if args.delete and not args.sync:
+        parser.error("--delete requires --sync")
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    console.print(f"Fetching metadata for article {args.article_id}...")
-    metadata = get_article_metadata(args.article_id)
-
-    files = metadata["files"]
-    if not files:
-        console.print("No files found in this article")
+    # API responses are revalidated with ETag and Last-Modified, so unchanged listings cost one 304 each.
+    cache = MetadataCache(args.output_dir / METADATA_CACHE_NAME, args.metadata_ttl)
+    if args.group:
+        kind = args.group[:-1]
+        files = iter_group_files(args.group, args.article_id, args.listing_workers, cache)
+    else:
+        kind = "article"
+        files = iter_article_files(args.article_id, args.listing_workers, cache)
+    console.print(f"Downloading files of {kind} {args.article_id} to: {args.output_dir.absolute()}\n")
+    # All articles share one download pool, so --workers and --segments bound the whole run.
+    if args.sync:
+        summary = sync_files(
+            files,
+            args.output_dir,
+            args.workers,
+            args.segments,
+            extract=args.extract,
+            delete=args.delete,
+        )
+    else:
+        summary = download_files(files, args.output_dir, args.workers, args.segments, extract=args.extract)
+    cache.save()
+    if not summary.downloaded and not summary.skipped and not summary.failed:
+        console.print(f"No files found in this {kind}")
         return 1
 
-    console.print(f"\nFound {len(files)} file(s) to download:")
-    for f in files:
-        size_mb = f["size"] / (1024 * 1024)
-        console.print(f"  - {f['name']} ({size_mb:.2f} MB)")
-
-    console.print(f"\nDownloading to: {args.output_dir.absolute()}\n")
-
-    for file_info in files:
-        filename = file_info["name"]
-        download_url = file_info["download_url"]
-        size = file_info["size"]
-        md5 = file_info["supplied_md5"]
-
-        output_path = args.output_dir / filename
-
-        console.print(f"Downloading {filename}...")
-        download_file(download_url, output_path, size, md5)
-        console.print(f"  Saved to {output_path}\n")
-
+    rate = summary.bytes_downloaded / summary.seconds / (1024 * 1024) if summary.seconds else 0.0
+    console.print(
+        f"\nDownloaded {summary.downloaded} file(s), {summary.bytes_downloaded / (1024 * 1024):.2f} MB "
+        f"in {summary.seconds:.1f}s ({rate:.2f} MB/s), {summary.skipped} already complete",
+    )
+    if summary.removed:
+        console.print(f"Removed {summary.removed} local file(s) no longer in the {kind}")
+    if summary.failed:
+        console.print(f"[red]{len(summary.failed)} file(s) failed: {', '.join(sorted(summary.failed))}")
+        return 1
     console.print("All files downloaded successfully")
     return 0
 
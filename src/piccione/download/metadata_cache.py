@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, TypedDict
+from urllib.parse import urlencode
+
+import requests
+
+HTTP_NOT_MODIFIED = 304
+
+
+class MetadataRecord(TypedDict):
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    data: Any
+
+
+class MetadataCache:
+    """
+    JSON responses of API calls, keyed by URL and query string.
+
+    A record younger than ``ttl`` seconds is returned without any request.
+    Older records are revalidated with ``If-None-Match`` and
+    ``If-Modified-Since``, so an unchanged resource costs one ``304`` and its
+    body is neither downloaded nor parsed again. With a path the records are
+    loaded from and saved to a JSON file, so they survive across runs.
+    """
+
+    def __init__(self, path: str | Path | None = None, ttl: float = 0) -> None:
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self._records: dict[str, MetadataRecord] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path is not None and self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self._records = json.load(f)
+
+    def get_json(self, url: str, params: dict[str, int] | None = None, timeout: float = 30) -> Any:  # noqa: ANN401
+        key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        with self._lock:
+            record = self._records.get(key)
+        now = time.time()
+        if record is not None and now - record["fetched_at"] < self.ttl:
+            return record["data"]
+
+        headers = {}
+        if record is not None:
+            if record["etag"]:
+                headers["If-None-Match"] = record["etag"]
+            if record["last_modified"]:
+                headers["If-Modified-Since"] = record["last_modified"]
+        response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        if record is not None and response.status_code == HTTP_NOT_MODIFIED:
+            with self._lock:
+                record["fetched_at"] = now
+                self._dirty = True
+            return record["data"]
+
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        # Responses without validators can only be reused within the TTL.
+        if etag or last_modified or self.ttl > 0:
+            with self._lock:
+                self._records[key] = {"etag": etag, "last_modified": last_modified, "fetched_at": now, "data": data}
+                self._dirty = True
+        return data
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(self._records, f)
+            tmp_path.replace(self.path)
+            self._dirty = False
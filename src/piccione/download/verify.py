@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+"""
+Check a local mirror against its remote manifest.
+
+Figshare mirrors are compared with the size and ``supplied_md5`` of every
+file in the article; SharePoint mirrors with the sizes recorded in their
+``structure.json``. Files are hashed across a process pool, largest first,
+and the result is a JSON report of missing, corrupt and extra files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, TypedDict
+
+from rich.console import Console
+
+from piccione.digest_cache import compute_md5
+from piccione.download.from_figshare import (
+    DIGEST_CACHE_NAME,
+    MANIFEST_NAME,
+    METADATA_CACHE_NAME,
+    iter_article_files,
+)
+from piccione.download.from_sharepoint import FolderNode, collect_files_from_structure
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# The report may go to stdout, so progress messages are kept on stderr.
+console = Console(stderr=True)
+
+READ_SIZE = 16777216
+STRUCTURE_NAME = "structure.json"
+
+
+class ExpectedFile(TypedDict):
+    size: int
+    md5: str | None
+
+
+class CorruptFile(TypedDict):
+    path: str
+    reason: str
+
+
+@dataclass
+class VerifyReport:
+    checked: int = 0
+    ok: int = 0
+    missing: list[str] = field(default_factory=list)
+    corrupt: list[CorruptFile] = field(default_factory=list)
+    extra: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.missing and not self.corrupt
+
+
+def figshare_manifest(article_id: int) -> dict[str, ExpectedFile]:
+    return {f["name"]: {"size": f["size"], "md5": f["supplied_md5"]} for f in iter_article_files(article_id)}
+
+
+def sharepoint_manifest(mirror: Path) -> dict[str, ExpectedFile]:
+    with (mirror / STRUCTURE_NAME).open(encoding="utf-8") as f:
+        data = json.load(f)
+    structure = {name: FolderNode.from_dict(node) for name, node in data["structure"].items()}
+    return {
+        local_path: {"size": metadata.size, "md5": None}
+        for _, local_path, metadata in collect_files_from_structure(structure, data["folder_paths"])
+    }
+
+
+def hash_file(path: Path) -> str:
+    return compute_md5(path, READ_SIZE)[0]
+
+
+def find_extra(mirror: Path, expected: Iterable[str], ignored: set[str]) -> list[str]:
+    known = set(expected) | ignored
+    return sorted(
+        relative
+        for path in mirror.rglob("*")
+        if path.is_file() and (relative := path.relative_to(mirror).as_posix()) not in known
+    )
+
+
+def verify_mirror(
+    mirror: Path,
+    expected: dict[str, ExpectedFile],
+    workers: int | None = None,
+    ignored: set[str] | None = None,
+) -> VerifyReport:
+    report = VerifyReport(checked=len(expected))
+    to_hash: list[tuple[str, int, str]] = []
+    for name, entry in expected.items():
+        path = mirror / name
+        if not path.is_file():
+            report.missing.append(name)
+            continue
+        size = path.stat().st_size
+        if size != entry["size"]:
+            report.corrupt.append({"path": name, "reason": f"size {size}, expected {entry['size']}"})
+        elif entry["md5"]:
+            to_hash.append((name, size, entry["md5"]))
+        else:
+            report.ok += 1
+
+    # The largest files start first, so a big file is never left to run alone at the end.
+    to_hash.sort(key=lambda item: item[1], reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(hash_file, mirror / name): (name, md5) for name, _, md5 in to_hash}
+        for future in as_completed(futures):
+            name, md5 = futures[future]
+            actual = future.result()
+            if actual == md5:
+                report.ok += 1
+            else:
+                report.corrupt.append({"path": name, "reason": f"MD5 {actual}, expected {md5}"})
+
+    report.missing.sort()
+    report.corrupt.sort(key=lambda item: item["path"])
+    report.extra = find_extra(mirror, expected, ignored or set())
+    return report
+
+
+def main() -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Verify a local mirror against its remote manifest")
+    parser.add_argument("source", choices=["figshare", "sharepoint"], help="Where the mirror was downloaded from")
+    parser.add_argument("mirror", type=Path, help="Local mirror directory")
+    parser.add_argument("--article-id", type=int, help="Figshare article ID, required for figshare mirrors")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of hashing processes (default: number of CPUs)",
+    )
+    parser.add_argument("-r", "--report", type=Path, help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    if args.source == "figshare":
+        if args.article_id is None:
+            parser.error("--article-id is required for figshare mirrors")
+        expected = figshare_manifest(args.article_id)
+        ignored = {DIGEST_CACHE_NAME, METADATA_CACHE_NAME, MANIFEST_NAME}
+    else:
+        expected = sharepoint_manifest(args.mirror)
+        ignored = {STRUCTURE_NAME}
+
+    report = verify_mirror(args.mirror, expected, args.workers, ignored)
+    output = json.dumps(asdict(report), indent=2, ensure_ascii=False)
+    if args.report:
+        args.report.write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+    console.print(
+        f"Checked {report.checked} file(s): {report.ok} ok, {len(report.missing)} missing, "
+        f"{len(report.corrupt)} corrupt, {len(report.extra)} extra",
+    )
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+T = TypeVar("T")
+
+
+def iter_windowed_pages(fetch_page: Callable[[int], list[T]], page_size: int, workers: int) -> Iterator[T]:
+    entries = fetch_page(1)
+    yield from entries
+    if len(entries) < page_size:
+        return
+    next_page = 2
+    # The Figshare API does not report the number of entries, so further pages are fetched in concurrent
+    # windows until one comes back short. Entries are yielded as soon as their page arrives.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            window = [executor.submit(fetch_page, page) for page in range(next_page, next_page + workers)]
+            for future in window:
+                page_entries = future.result()
+                yield from page_entries
+                if len(page_entries) < page_size:
+                    # Pages of the window past the short one are not requested if they have not started yet.
+                    for pending in window:
+                        pending.cancel()
+                    return
+            next_page += workers
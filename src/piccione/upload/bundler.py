@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+"""
+Pack small files into archives before uploading them.
+
+Each uploaded file costs several API calls regardless of its size, so many
+small files are grouped into archives of about ``target_size`` bytes. Archives
+are reproducible: members are stored uncompressed, in path order, with the
+metadata of the original files, so the same inputs always give the same bytes
+and an archive that is already online is recognised by its MD5.
+"""
+
+from __future__ import annotations
+
+import json
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TypedDict
+
+BUNDLE_THRESHOLD = 8388608
+BUNDLE_TARGET_SIZE = 1073741824
+ARCHIVE_FORMATS = ("tar", "zip")
+ZIP_MIN_YEAR = 1980
+
+
+class ManifestEntry(TypedDict):
+    archive: str
+    member: str
+
+
+class SourceSignature(TypedDict):
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass(frozen=True)
+class BundleOptions:
+    directory: Path
+    threshold: int = BUNDLE_THRESHOLD
+    target_size: int = BUNDLE_TARGET_SIZE
+    archive_format: str = "tar"
+    prefix: str = "bundle"
+
+
+def plan_bundles(files: list[str], threshold: int, target_size: int) -> tuple[list[str], list[list[str]]]:
+    large: list[str] = []
+    small: list[tuple[str, int]] = []
+    for file in files:
+        size = Path(file).stat().st_size
+        if size < threshold:
+            small.append((file, size))
+        else:
+            large.append(file)
+
+    groups: list[list[str]] = []
+    current: list[str] = []
+    current_size = 0
+    for file, size in sorted(small):
+        if current and current_size + size > target_size:
+            groups.append(current)
+            current, current_size = [], 0
+        current.append(file)
+        current_size += size
+    if current:
+        groups.append(current)
+    return large, groups
+
+
+def member_names(files: list[str]) -> list[str]:
+    names: list[str] = []
+    used: set[str] = set()
+    for index, file in enumerate(files):
+        name = Path(file).name
+        if name in used:
+            name = f"{index}/{name}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def write_tar(archive_path: Path, members: list[tuple[str, str]]) -> None:
+    with tarfile.open(archive_path, "w", format=tarfile.PAX_FORMAT) as tar:
+        for file, name in members:
+            info = tar.gettarinfo(file, arcname=name)
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            with Path(file).open("rb") as f:
+                tar.addfile(info, f)
+
+
+def write_zip(archive_path: Path, members: list[tuple[str, str]]) -> None:
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for file, name in members:
+            modified = datetime.fromtimestamp(Path(file).stat().st_mtime, tz=timezone.utc)
+            info = zipfile.ZipInfo(name, date_time=modified.timetuple()[:6])
+            if modified.year < ZIP_MIN_YEAR:
+                info.date_time = (ZIP_MIN_YEAR, 1, 1, 0, 0, 0)
+            info.external_attr = 0o644 << 16
+            with Path(file).open("rb") as source, archive.open(info, "w", force_zip64=True) as target:
+                while chunk := source.read(1048576):
+                    target.write(chunk)
+
+
+def signature(files: list[str]) -> list[SourceSignature]:
+    signatures: list[SourceSignature] = []
+    for file in files:
+        stat = Path(file).stat()
+        signatures.append({"path": str(Path(file).absolute()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+    return signatures
+
+
+def bundle_files(files: list[str], options: BundleOptions) -> list[str]:
+    if options.archive_format not in ARCHIVE_FORMATS:
+        msg = f"Unsupported archive format {options.archive_format!r}, expected one of {ARCHIVE_FORMATS}"
+        raise ValueError(msg)
+    options.directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = options.directory / f"{options.prefix}-manifest.json"
+    previous: dict[str, list[SourceSignature]] = {}
+    if manifest_path.exists():
+        with manifest_path.open(encoding="utf-8") as f:
+            previous = json.load(f)["archives"]
+
+    large, groups = plan_bundles(files, options.threshold, options.target_size)
+    archives: dict[str, list[SourceSignature]] = {}
+    entries: dict[str, ManifestEntry] = {}
+    uploads = list(large)
+    for index, group in enumerate(groups):
+        archive_name = f"{options.prefix}-{index:04d}.{options.archive_format}"
+        archive_path = options.directory / archive_name
+        members = list(zip(group, member_names(group), strict=True))
+        archives[archive_name] = signature(group)
+        # Unchanged archives are not rewritten, so their digest stays cached and they are skipped.
+        if not archive_path.exists() or previous.get(archive_name) != archives[archive_name]:
+            (write_zip if options.archive_format == "zip" else write_tar)(archive_path, members)
+        for file, name in members:
+            entries[str(Path(file).absolute())] = {"archive": archive_name, "member": name}
+        uploads.append(str(archive_path))
+
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump({"archives": archives, "files": entries}, f, indent=2)
+    tmp_path.replace(manifest_path)
+    return uploads
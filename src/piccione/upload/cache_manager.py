@@ -16,7 +16,9 @@ class CacheManager:
         redis_host: str = "localhost",
         redis_port: int = 6379,
         redis_db: int = 4,
+        key: str = REDIS_KEY,
     ) -> None:
+        self.key = key
         self.processed_files: set[str] = set()
         try:
             self._redis = redis.Redis(
@@ -29,15 +31,15 @@ class CacheManager:
         except RedisConnectionError as err:
             msg = "Redis is not available. Cache requires Redis."
             raise RuntimeError(msg) from err
-        self.processed_files.update(cast("set[str]", self._redis.smembers(self.REDIS_KEY)))
+        self.processed_files.update(cast("set[str]", self._redis.smembers(self.key)))
 
     def add(self, filename: str) -> None:
         self.processed_files.add(filename)
-        self._redis.sadd(self.REDIS_KEY, filename)
+        self._redis.sadd(self.key, filename)
 
     def __contains__(self, filename: str) -> bool:
         return filename in self.processed_files
 
     def get_all(self) -> set[str]:
-        self.processed_files.update(cast("set[str]", self._redis.smembers(self.REDIS_KEY)))
+        self.processed_files.update(cast("set[str]", self._redis.smembers(self.key)))
         return self.processed_files
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Self
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 65536
+
+
+class DirectoryWatcher:
+    """
+    Report files that appear in a directory.
+
+    Uses inotify on Linux, so files are reported as soon as their writer closes
+    them or they are moved in. Elsewhere, the directory is polled: it is only
+    rescanned when its mtime changes, and a new file is reported once its size
+    and mtime are stable across two scans.
+    """
+
+    def __init__(self, folder: str | Path, suffix: str, poll_interval: float = 1.0) -> None:
+        self.folder = Path(folder)
+        self.suffix = suffix
+        self.poll_interval = poll_interval
+        self._fd: int | None = self._init_inotify()
+        self._dir_mtime: int | None = None
+        self._known: set[str] = set()
+        self._candidates: dict[str, tuple[int, int]] = {}
+        if self._fd is None:
+            self._known = self._scan()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def _init_inotify(self) -> int | None:
+        if not sys.platform.startswith("linux"):
+            return None
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(self.folder), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _scan(self) -> set[str]:
+        with os.scandir(self.folder) as entries:
+            return {entry.name for entry in entries if entry.name.endswith(self.suffix) and entry.is_file()}
+
+    def poll(self, timeout: float) -> list[str]:
+        if self._fd is not None:
+            return self._read_events(timeout)
+        return self._poll_directory(timeout)
+
+    def _read_events(self, timeout: float) -> list[str]:
+        if self._fd is None:
+            return []
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        names: list[str] = []
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped by the kernel: fall back to a full listing.
+                return sorted(self._scan())
+            if name.endswith(self.suffix) and name not in names:
+                names.append(name)
+        return names
+
+    def _poll_directory(self, timeout: float) -> list[str]:
+        time.sleep(min(timeout, self.poll_interval))
+        dir_mtime = self.folder.stat().st_mtime_ns
+        if dir_mtime == self._dir_mtime and not self._candidates:
+            return []
+        self._dir_mtime = dir_mtime
+
+        new_names = self._scan() - self._known
+        self._candidates = {name: signature for name, signature in self._candidates.items() if name in new_names}
+        ready: list[str] = []
+        for name in sorted(new_names):
+            try:
+                stat = (self.folder / name).stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._candidates.get(name) == signature:
+                del self._candidates[name]
+                self._known.add(name)
+                ready.append(name)
+            else:
+                self._candidates[name] = signature
+        return ready
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        _exc_type: type[BaseException] | None,
+        _exc_val: BaseException | None,
+        _exc_tb: object,
+    ) -> None:
+        self.close()
@@ -3,23 +3,49 @@
 # SPDX-License-Identifier: ISC
 
 import argparse
-import hashlib
 import json
+import os
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, TypedDict, cast
+from queue import Empty, Full, Queue
+from typing import Any, TypedDict, TypeVar, cast
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from rich.console import Console
 from tqdm import tqdm
 
+from piccione.digest_cache import DigestCache, compute_md5
+from piccione.pagination import iter_windowed_pages
+from piccione.upload.bundler import BUNDLE_TARGET_SIZE, BUNDLE_THRESHOLD, BundleOptions, bundle_files
+
 console = Console()
 
 BASE_URL = "https://api.figshare.com/v2/account/articles"
 CHUNK_SIZE = 1048576
 HTTP_INTERNAL_SERVER_ERROR = 500
+PART_WORKERS = 4
+PIPELINE_DEPTH = 2
+READ_BUFFER_SIZE = 65536
+FILES_PAGE_SIZE = 1000
+LISTING_WORKERS = 4
+ARTICLE_WORKERS = 4
+VERIFY_WORKERS = 4
+VERIFY_POLL_INTERVAL = 5.0
+VERIFY_TIMEOUT = 600.0
+QUEUE_POLL_INTERVAL = 0.1
+
+T = TypeVar("T")
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
 
 
 class FigshareFileInfo(TypedDict):
@@ -27,7 +53,11 @@ class FigshareFileInfo(TypedDict):
     id: int | str
 
 
-class FigsharePart(TypedDict):
+class _FigsharePartStatus(TypedDict, total=False):
+    status: str
+
+
+class FigsharePart(_FigsharePartStatus):
     partNo: int
     startOffset: int
     endOffset: int
@@ -40,37 +70,136 @@ class FigsharePartsResponse(TypedDict):
 class FigshareExistingFile(TypedDict):
     id: int | str
     md5: str
+    size: int
+
+
+class PendingUpload(TypedDict):
+    id: int | str
+    upload_url: str
+    md5: str
+    size: int
+
+
+class Throttle:
+    """Byte rate limit shared by concurrent transfers: each caller waits for its turn in a common schedule."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def consume(self, amount: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + amount / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+@dataclass
+class TransferLimits:
+    connections: threading.BoundedSemaphore | None = None
+    throttle: Throttle | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "TransferLimits":
+        max_connections = config.get("MAX_CONNECTIONS")
+        bandwidth = config.get("BANDWIDTH_LIMIT")
+        return cls(
+            connections=threading.BoundedSemaphore(max_connections) if max_connections else None,
+            throttle=Throttle(bandwidth) if bandwidth else None,
+        )
+
+
+class PartReader:
+    """
+    File-like view of one part of a file, read into a single reusable buffer.
+
+    The HTTP client pulls the part in blocks and sends each one before reading
+    the next, so an in-flight part never holds more than READ_BUFFER_SIZE bytes
+    in memory, however large it is.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        offset: int,
+        size: int,
+        buffer_size: int = READ_BUFFER_SIZE,
+        throttle: Throttle | None = None,
+    ) -> None:
+        self.fd = fd
+        self.offset = offset
+        self.size = size
+        self.throttle = throttle
+        self._position = 0
+        self._buffer = bytearray(min(buffer_size, size))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        while block := self.read(len(self._buffer)):
+            yield block
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, position: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: self.size}[whence]
+        self._position = max(0, min(self.size, base + position))
+        return self._position
+
+    def read(self, size: int = -1) -> memoryview:
+        remaining = self.size - self._position
+        count = remaining if size < 0 else min(size, remaining)
+        view = memoryview(self._buffer)[: min(count, len(self._buffer))]
+        read = os.preadv(self.fd, [view], self.offset + self._position)
+        self._position += read
+        if self.throttle is not None:
+            self.throttle.consume(read)
+        return view[:read]
 
 
 def get_file_check_data(file_name: str | Path) -> tuple[str, int]:
-    with Path(file_name).open("rb") as fin:
-        md5 = hashlib.md5(usedforsecurity=False)
-        size = 0
-        data = fin.read(CHUNK_SIZE)
-        while data:
-            size += len(data)
-            md5.update(data)
-            data = fin.read(CHUNK_SIZE)
-        return md5.hexdigest(), size
+    return compute_md5(file_name, CHUNK_SIZE)
+
+
+def get_session(token: str, pool_size: int = PART_WORKERS) -> requests.Session:
+    # One keep-alive session per token, shared by all threads; the pool size only applies on first use.
+    with _sessions_lock:
+        session = _sessions.get(token)
+        if session is None:
+            session = requests.Session()
+            session.headers["Authorization"] = f"token {token}"
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[token] = session
+        return session
 
 
 def issue_request(
     method: str,
     url: str,
     token: str,
-    data: str | bytes | dict[str, object] | None = None,
+    data: str | bytes | dict[str, object] | PartReader | None = None,
     *,
     binary: bool = False,
 ) -> dict[str, object] | bytes:
-    headers = {"Authorization": "token " + token}
+    session = get_session(token)
     if data is not None and not binary:
         data = json.dumps(data)
 
     attempt = 0
     while True:
         attempt += 1
+        if isinstance(data, PartReader):
+            data.seek(0)
         try:
-            response = requests.request(method, url, headers=headers, data=data, timeout=(30, 300))
+            # requests reads a PartReader like any file object, which its type stubs do not model.
+            response = session.request(method, url, data=cast("Any", data), timeout=(30, 300))
             if response.status_code >= HTTP_INTERNAL_SERVER_ERROR:
                 console.print(f"[ERROR] Server error {response.status_code}: {response.text[:200]}")
                 wait = min(2 ** (attempt - 1), 60)
@@ -94,7 +223,13 @@ def issue_request(
             raise
 
 
-def upload_parts(file_info: FigshareFileInfo, file_path: str | Path, token: str) -> None:
+def upload_parts(
+    file_info: FigshareFileInfo,
+    file_path: str | Path,
+    token: str,
+    workers: int = PART_WORKERS,
+    limits: TransferLimits | None = None,
+) -> None:
     result = issue_request(method="GET", url=file_info["upload_url"], token=token)
     if not isinstance(result, dict):
         msg = "Expected dict response"
@@ -103,48 +238,84 @@ def upload_parts(file_info: FigshareFileInfo, file_path: str | Path, token: str)
 
     parts = cast("FigsharePartsResponse", result)["parts"]
     total_size = sum(part["endOffset"] - part["startOffset"] + 1 for part in parts)
-
-    with (
-        Path(file_path).open("rb") as fin,
-        tqdm(total=total_size, unit="B", unit_scale=True, unit_divisor=1024) as pbar,
-    ):
-        for part in parts:
-            chunk_size = part["endOffset"] - part["startOffset"] + 1
-            upload_part(file_info, fin, part, token)
-            pbar.update(chunk_size)
-
-
-def upload_part(file_info: FigshareFileInfo, stream: BinaryIO, part: FigsharePart, token: str) -> None:
+    # Parts already stored by Figshare, e.g. before an interrupted run, are not sent again.
+    parts = [part for part in parts if part.get("status") != "COMPLETE"]
+    uploaded = total_size - sum(part["endOffset"] - part["startOffset"] + 1 for part in parts)
+
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        with (
+            ThreadPoolExecutor(max_workers=workers) as executor,
+            tqdm(total=total_size, initial=uploaded, unit="B", unit_scale=True, unit_divisor=1024) as pbar,
+        ):
+            futures = {executor.submit(upload_part, file_info, fd, part, token, limits): part for part in parts}
+            for future in as_completed(futures):
+                future.result()
+                part = futures[future]
+                pbar.update(part["endOffset"] - part["startOffset"] + 1)
+    finally:
+        os.close(fd)
+
+
+def upload_part(
+    file_info: FigshareFileInfo,
+    fd: int,
+    part: FigsharePart,
+    token: str,
+    limits: TransferLimits | None = None,
+) -> None:
+    limits = limits or TransferLimits()
     url = f"{file_info['upload_url']}/{part['partNo']}"
-    stream.seek(part["startOffset"])
-    data = stream.read(part["endOffset"] - part["startOffset"] + 1)
-    issue_request(method="PUT", url=url, data=data, binary=True, token=token)
+    # Positional reads do not move a shared offset, so parts can be read concurrently from one descriptor.
+    data = PartReader(fd, part["startOffset"], part["endOffset"] - part["startOffset"] + 1, throttle=limits.throttle)
+    with limits.connections or nullcontext():
+        issue_request(method="PUT", url=url, data=data, binary=True, token=token)
     console.print("  Uploaded part {partNo} from {startOffset} to {endOffset}".format_map(part))
 
 
-def get_existing_files(article_id: str, token: str) -> dict[str, FigshareExistingFile]:
+def get_files_page(article_id: str, token: str, page: int) -> list[dict[str, object]]:
     url = f"{BASE_URL}/{article_id}/files"
-    headers = {"Authorization": f"token {token}"}
-    response = requests.get(url, headers=headers, timeout=30)
+    response = get_session(token).get(url, params={"page": page, "page_size": FILES_PAGE_SIZE}, timeout=30)
     response.raise_for_status()
-    return {f["name"]: {"id": f["id"], "md5": f["computed_md5"]} for f in response.json()}
+    return response.json()
+
+
+def get_existing_files(
+    article_id: str,
+    token: str,
+    workers: int = LISTING_WORKERS,
+) -> dict[str, FigshareExistingFile]:
+    files = iter_windowed_pages(lambda page: get_files_page(article_id, token, page), FILES_PAGE_SIZE, workers)
+    return {
+        cast("str", f["name"]): {
+            "id": cast("int | str", f["id"]),
+            "md5": cast("str", f["computed_md5"]),
+            "size": cast("int", f["size"]),
+        }
+        for f in files
+    }
 
 
 def delete_file(article_id: str, file_id: str, token: str) -> None:
     url = f"{BASE_URL}/{article_id}/files/{file_id}"
-    headers = {"Authorization": f"token {token}"}
-    response = requests.delete(url, headers=headers, timeout=30)
+    response = get_session(token).delete(url, timeout=30)
     response.raise_for_status()
 
 
-def create_file(article_id: str, file_name: str, file_path: str | Path, token: str) -> FigshareFileInfo:
+def create_file(
+    article_id: str,
+    file_name: str,
+    file_path: str | Path,
+    token: str,
+    check_data: tuple[str, int] | None = None,
+) -> FigshareFileInfo:
     url = f"{BASE_URL}/{article_id}/files"
-    headers = {"Authorization": f"token {token}"}
-    md5, size = get_file_check_data(file_path)
+    session = get_session(token)
+    md5, size = check_data if check_data is not None else get_file_check_data(file_path)
     data = {"name": Path(file_name).name, "md5": md5, "size": size}
-    post_response = requests.post(url, headers=headers, json=data, timeout=30)
+    post_response = session.post(url, json=data, timeout=30)
     post_response.raise_for_status()
-    get_response = requests.get(post_response.json()["location"], headers=headers, timeout=30)
+    get_response = session.get(post_response.json()["location"], timeout=30)
     get_response.raise_for_status()
     return get_response.json()
 
@@ -155,35 +326,484 @@ def complete_upload(article_id: str, file_id: str, token: str) -> None:
     console.print(f"  Upload completion confirmed for file {file_id}")
 
 
-def main(config_path: str | Path) -> None:
-    with Path(config_path).open() as f:
-        config = yaml.safe_load(f)
+class UploadState:
+    """
+    Files created on Figshare whose upload has not been completed yet,
+    optionally persisted to a JSON file so that a later run can resume them.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._pending: dict[str, PendingUpload] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self._pending = json.load(f)
+
+    def get(self, file_path: str | Path) -> PendingUpload | None:
+        with self._lock:
+            return self._pending.get(str(Path(file_path).absolute()))
+
+    def record(self, file_path: str | Path, file_info: FigshareFileInfo, check_data: tuple[str, int]) -> None:
+        with self._lock:
+            self._pending[str(Path(file_path).absolute())] = {
+                "id": file_info["id"],
+                "upload_url": file_info["upload_url"],
+                "md5": check_data[0],
+                "size": check_data[1],
+            }
+            self._save()
+
+    def finish(self, file_path: str | Path) -> None:
+        with self._lock:
+            if self._pending.pop(str(Path(file_path).absolute()), None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self._pending, f)
+        tmp_path.replace(self.path)
+
+
+@dataclass
+class UploadJob:
+    file_path: str
+    check_data: tuple[str, int]
+    # None when the file is already on Figshare and there is nothing to upload.
+    file_info: FigshareFileInfo | None
+    resumed: bool = False
+
+
+def put_item(queue: Queue[T | None], item: T | None, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+        except Full:
+            continue
+        return True
+    return False
 
-    token = config["TOKEN"]
-    article_id = config["ARTICLE_ID"]
-    files_to_upload = config["files_to_upload"]
 
-    console.print(f"Starting upload of {len(files_to_upload)} files to Figshare...")
+def iterate_queue(queue: Queue[T | None], stop: threading.Event) -> Iterator[T]:
+    while not stop.is_set():
+        try:
+            item = queue.get(timeout=QUEUE_POLL_INTERVAL)
+        except Empty:
+            continue
+        if item is None:
+            return
+        yield item
+
+
+def hash_files(
+    files: list[str],
+    digests: DigestCache,
+    output: Queue[tuple[str, tuple[str, int]] | None],
+    stop: threading.Event,
+) -> None:
+    try:
+        for file_path in files:
+            if not put_item(output, (file_path, digests.get(file_path)), stop):
+                return
+    finally:
+        put_item(output, None, stop)
+
+
+def start_upload(
+    article_id: str,
+    file_path: str,
+    check_data: tuple[str, int],
+    token: str,
+    existing_files: dict[str, FigshareExistingFile],
+    state: UploadState,
+) -> FigshareFileInfo:
+    file_name = Path(file_path).name
+    if file_name in existing_files:
+        console.print(f"\n[REPLACE] {file_name} (MD5 mismatch, deleting old version)")
+        delete_file(article_id, str(existing_files[file_name]["id"]), token)
+
+    console.print(f"\nPreparing {file_name}...")
+    file_info = create_file(article_id, file_name, file_path, token, check_data)
+    state.record(file_path, file_info, check_data)
+    return file_info
+
+
+def register_files(
+    article_id: str,
+    token: str,
+    existing_files: dict[str, FigshareExistingFile],
+    state: UploadState,
+    hashed: Queue[tuple[str, tuple[str, int]] | None],
+    output: Queue[UploadJob | None],
+    stop: threading.Event,
+) -> None:
+    try:
+        for file_path, check_data in iterate_queue(hashed, stop):
+            file_name = Path(file_path).name
+            pending = state.get(file_path)
+
+            if file_name in existing_files and existing_files[file_name]["md5"] == check_data[0]:
+                console.print(f"\n[SKIP] {file_name} (already uploaded, MD5 matches)")
+                state.finish(file_path)
+                job = UploadJob(file_path, check_data, None)
+            elif pending is not None and (pending["md5"], pending["size"]) == check_data:
+                file_info: FigshareFileInfo = {"id": pending["id"], "upload_url": pending["upload_url"]}
+                job = UploadJob(file_path, check_data, file_info, resumed=True)
+            else:
+                job = UploadJob(
+                    file_path,
+                    check_data,
+                    start_upload(article_id, file_path, check_data, token, existing_files, state),
+                )
+            if not put_item(output, job, stop):
+                return
+    finally:
+        put_item(output, None, stop)
+
+
+def resume_upload(
+    article_id: str,
+    file_info: FigshareFileInfo,
+    file_path: str | Path,
+    token: str,
+    workers: int,
+    limits: TransferLimits | None = None,
+) -> bool:
+    try:
+        upload_parts(file_info, file_path, token, workers, limits)
+    except HTTPError:
+        return False
+    complete_upload(article_id, str(file_info["id"]), token)
+    return True
+
+
+def upload_job(
+    article_id: str,
+    job: UploadJob,
+    token: str,
+    workers: int,
+    existing_files: dict[str, FigshareExistingFile],
+    state: UploadState,
+    limits: TransferLimits | None = None,
+) -> FigshareFileInfo | None:
+    if job.file_info is None:
+        return None
+    file_name = Path(job.file_path).name
+    file_info = job.file_info
+    if job.resumed:
+        console.print(f"\n[RESUME] {file_name} (continuing interrupted upload)")
+        if resume_upload(article_id, file_info, job.file_path, token, workers, limits):
+            state.finish(job.file_path)
+            console.print(f"[OK] {file_name} completed")
+            return file_info
+        console.print(f"Could not resume {file_name}, starting over")
+        file_info = start_upload(article_id, job.file_path, job.check_data, token, existing_files, state)
+
+    upload_parts(file_info, job.file_path, token, workers, limits)
+    complete_upload(article_id, str(file_info["id"]), token)
+    state.finish(job.file_path)
+    console.print(f"[OK] {file_name} completed")
+    return file_info
+
+
+class VerificationResult(TypedDict):
+    file: str
+    file_id: int | str
+    local_md5: str
+    remote_md5: str
+    status: str
+
+
+@dataclass(frozen=True)
+class VerifyOptions:
+    report: Path
+    timeout: float = VERIFY_TIMEOUT
+    poll_interval: float = VERIFY_POLL_INTERVAL
+    workers: int = VERIFY_WORKERS
+
+
+def get_file_status(article_id: str, file_id: str, token: str) -> dict[str, Any]:
+    response = get_session(token).get(f"{BASE_URL}/{article_id}/files/{file_id}", timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def verify_upload(
+    article_id: str,
+    file_path: str,
+    file_id: int | str,
+    local_md5: str,
+    token: str,
+    options: VerifyOptions,
+) -> VerificationResult:
+    result: VerificationResult = {
+        "file": file_path,
+        "file_id": file_id,
+        "local_md5": local_md5,
+        "remote_md5": "",
+        "status": "unverified",
+    }
+    deadline = time.monotonic() + options.timeout
+    # Figshare computes the digest after the upload is completed, so it may take a while to show up.
+    while True:
+        try:
+            remote_md5 = get_file_status(article_id, str(file_id), token).get("computed_md5") or ""
+        except requests.exceptions.RequestException as e:
+            console.print(f"[ERROR] Could not verify {Path(file_path).name}: {e}")
+            return result
+        if remote_md5:
+            result["remote_md5"] = remote_md5
+            result["status"] = "ok" if remote_md5 == local_md5 else "mismatch"
+            return result
+        if time.monotonic() >= deadline:
+            return result
+        time.sleep(options.poll_interval)
+
+
+class UploadVerifier:
+    """Compare completed uploads with the MD5 computed by Figshare, in the background."""
+
+    def __init__(self, article_id: str, token: str, options: VerifyOptions) -> None:
+        self.article_id = article_id
+        self.token = token
+        self.options = options
+        self._executor = ThreadPoolExecutor(max_workers=options.workers)
+        self._futures: list[Future[VerificationResult]] = []
+
+    def submit(self, file_path: str, file_id: int | str, local_md5: str) -> None:
+        self._futures.append(
+            self._executor.submit(
+                verify_upload,
+                self.article_id,
+                file_path,
+                file_id,
+                local_md5,
+                self.token,
+                self.options,
+            ),
+        )
+
+    def results(self) -> list[VerificationResult]:
+        self._executor.shutdown(wait=True)
+        return [future.result() for future in self._futures]
+
+    def cancel(self) -> None:
+        # Queued checks are dropped; a check already polling Figshare ends on its own timeout.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_verification_report(report_path: Path, results: list[VerificationResult]) -> None:
+    mismatched = [result for result in results if result["status"] == "mismatch"]
+    report = {
+        "verified": sum(result["status"] == "ok" for result in results),
+        "mismatched": mismatched,
+        "unverified": [result for result in results if result["status"] == "unverified"],
+    }
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with report_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    # Files to upload again, one per line, ready to be used as files_to_upload.
+    with report_path.with_suffix(".reupload.txt").open("w", encoding="utf-8") as f:
+        f.writelines(f"{result['file']}\n" for result in mismatched)
+
+
+@dataclass
+class ArticleSummary:
+    article_id: str
+    files: int
+    uploaded: int = 0
+    skipped: int = 0
+    bytes_uploaded: int = 0
+    seconds: float = 0.0
+    mismatched: int = 0
+    unverified: int = 0
+    error: str | None = None
+
+
+def upload_article(  # noqa: PLR0913
+    article_id: str,
+    files_to_upload: list[str],
+    token: str,
+    *,
+    digests: DigestCache,
+    state: UploadState,
+    part_workers: int = PART_WORKERS,
+    pipeline_depth: int = PIPELINE_DEPTH,
+    limits: TransferLimits | None = None,
+    verify: VerifyOptions | None = None,
+    bundle: BundleOptions | None = None,
+) -> ArticleSummary:
+    start = time.monotonic()
+    if bundle is not None:
+        console.print(f"Bundling files smaller than {bundle.threshold} bytes into {bundle.directory}...")
+        files_to_upload = bundle_files(files_to_upload, bundle)
+    summary = ArticleSummary(article_id, len(files_to_upload))
+    console.print(f"Starting upload of {len(files_to_upload)} files to Figshare article {article_id}...")
     existing_files = get_existing_files(article_id, token)
     console.print(f"Found {len(existing_files)} existing files in article")
 
-    for file_path in tqdm(files_to_upload, desc="Total progress", unit="file"):
-        file_name = Path(file_path).name
-        local_md5, _ = get_file_check_data(file_path)
+    # Hashing and file creation run ahead of the part uploads, at most pipeline_depth files per stage.
+    hashed: Queue[tuple[str, tuple[str, int]] | None] = Queue(maxsize=pipeline_depth)
+    ready: Queue[UploadJob | None] = Queue(maxsize=pipeline_depth)
+    stop = threading.Event()
+    verifier = UploadVerifier(article_id, token, verify) if verify is not None else None
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stages = [
+                executor.submit(hash_files, files_to_upload, digests, hashed, stop),
+                executor.submit(register_files, article_id, token, existing_files, state, hashed, ready, stop),
+            ]
+            try:
+                jobs = tqdm(iterate_queue(ready, stop), total=len(files_to_upload), desc="Total progress", unit="file")
+                for job in jobs:
+                    file_info = upload_job(article_id, job, token, part_workers, existing_files, state, limits)
+                    if file_info is None:
+                        summary.skipped += 1
+                        continue
+                    summary.uploaded += 1
+                    summary.bytes_uploaded += job.check_data[1]
+                    if verifier is not None:
+                        verifier.submit(job.file_path, file_info["id"], job.check_data[0])
+            finally:
+                stop.set()
+            for stage in stages:
+                stage.result()
+    except BaseException:
+        if verifier is not None:
+            verifier.cancel()
+        raise
+
+    if verifier is not None and verify is not None:
+        console.print(f"Waiting for Figshare to verify {summary.uploaded} uploaded files...")
+        results = verifier.results()
+        write_verification_report(verify.report, results)
+        summary.mismatched = sum(result["status"] == "mismatch" for result in results)
+        summary.unverified = sum(result["status"] == "unverified" for result in results)
+    summary.seconds = time.monotonic() - start
+    return summary
+
+
+def article_path(path: str | Path, article_id: str) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{article_id}{path.suffix}")
+
+
+def verify_options(config: dict[str, Any], article_id: str | None = None) -> VerifyOptions | None:
+    if not config.get("VERIFY"):
+        return None
+    report = Path(config.get("VERIFY_REPORT", "figshare_verification.json"))
+    return VerifyOptions(
+        report=article_path(report, article_id) if article_id is not None else report,
+        timeout=config.get("VERIFY_TIMEOUT", VERIFY_TIMEOUT),
+    )
+
+
+def bundle_options(config: dict[str, Any], article_id: str | None = None) -> BundleOptions | None:
+    bundle = config.get("BUNDLE")
+    if not bundle:
+        return None
+    prefix = bundle.get("prefix", "bundle")
+    return BundleOptions(
+        directory=Path(bundle["directory"]),
+        threshold=bundle.get("threshold", BUNDLE_THRESHOLD),
+        target_size=bundle.get("target_size", BUNDLE_TARGET_SIZE),
+        archive_format=bundle.get("format", "tar"),
+        prefix=f"{prefix}-{article_id}" if article_id is not None else prefix,
+    )
+
+
+def upload_articles(
+    articles: list[dict[str, Any]],
+    token: str,
+    config: dict[str, Any],
+    digests: DigestCache,
+    limits: TransferLimits,
+) -> list[ArticleSummary]:
+    def run(article: dict[str, Any]) -> ArticleSummary:
+        article_id = str(article["ARTICLE_ID"])
+        try:
+            return upload_article(
+                article_id,
+                article["files_to_upload"],
+                token,
+                digests=digests,
+                state=UploadState(
+                    article_path(config["UPLOAD_STATE"], article_id) if config.get("UPLOAD_STATE") else None,
+                ),
+                part_workers=config.get("PART_WORKERS", PART_WORKERS),
+                pipeline_depth=config.get("PIPELINE_DEPTH", PIPELINE_DEPTH),
+                limits=limits,
+                verify=verify_options(config, article_id),
+                bundle=bundle_options(config, article_id),
+            )
+        except Exception as e:  # noqa: BLE001
+            console.print(f"[ERROR] Article {article_id} failed: {e}")
+            return ArticleSummary(article_id, len(article["files_to_upload"]), error=str(e))
+
+    with ThreadPoolExecutor(max_workers=config.get("ARTICLE_WORKERS", ARTICLE_WORKERS)) as executor:
+        return list(executor.map(run, articles))
+
+
+def print_summaries(summaries: list[ArticleSummary]) -> None:
+    console.print("\nSummary:")
+    for summary in summaries:
+        if summary.error is not None:
+            console.print(f"  {summary.article_id}: FAILED ({summary.error})")
+            continue
+        rate = summary.bytes_uploaded / summary.seconds / 1048576 if summary.seconds else 0.0
+        line = (
+            f"  {summary.article_id}: {summary.uploaded} uploaded, {summary.skipped} skipped, "
+            f"{summary.bytes_uploaded / 1048576:.1f} MB in {summary.seconds:.1f}s ({rate:.1f} MB/s)"
+        )
+        if summary.mismatched or summary.unverified:
+            line += f", {summary.mismatched} MD5 mismatches, {summary.unverified} unverified"
+        console.print(line)
 
-        if file_name in existing_files:
-            if existing_files[file_name]["md5"] == local_md5:
-                console.print(f"\n[SKIP] {file_name} (already uploaded, MD5 matches)")
-                continue
-            console.print(f"\n[REPLACE] {file_name} (MD5 mismatch, deleting old version)")
-            delete_file(article_id, str(existing_files[file_name]["id"]), token)
 
-        console.print(f"\nPreparing {file_name}...")
-        file_info = create_file(article_id, file_name, file_path, token)
-        upload_parts(file_info, file_path, token)
-        complete_upload(article_id, str(file_info["id"]), token)
-        console.print(f"[OK] {file_name} completed")
+def main(config_path: str | Path) -> None:
+    with Path(config_path).open() as f:
+        config = yaml.safe_load(f)
 
+    token = config["TOKEN"]
+    part_workers = config.get("PART_WORKERS", PART_WORKERS)
+    limits = TransferLimits.from_config(config)
+    digests = DigestCache(config.get("DIGEST_CACHE"))
+
+    try:
+        if "articles" in config:
+            articles = config["articles"]
+            # Parts and registration requests of every article running at the same time.
+            concurrent_articles = min(len(articles), config.get("ARTICLE_WORKERS", ARTICLE_WORKERS))
+            get_session(token, pool_size=config.get("MAX_CONNECTIONS") or concurrent_articles * (part_workers + 2))
+            summaries = upload_articles(articles, token, config, digests, limits)
+        else:
+            # Parts of the current file plus the requests of the registration stage.
+            get_session(token, pool_size=part_workers + 2)
+            summaries = [
+                upload_article(
+                    str(config["ARTICLE_ID"]),
+                    config["files_to_upload"],
+                    token,
+                    digests=digests,
+                    state=UploadState(config.get("UPLOAD_STATE")),
+                    part_workers=part_workers,
+                    pipeline_depth=config.get("PIPELINE_DEPTH", PIPELINE_DEPTH),
+                    limits=limits,
+                    verify=verify_options(config),
+                    bundle=bundle_options(config),
+                ),
+            ]
+    finally:
+        digests.save()
+
+    print_summaries(summaries)
+    failed = [summary.article_id for summary in summaries if summary.error is not None or summary.mismatched]
+    if failed:
+        msg = f"Upload failed for articles: {', '.join(failed)}"
+        raise RuntimeError(msg)
     console.print("\nAll files uploaded successfully to Figshare!")
 
 
@@ -3,16 +3,44 @@
 # SPDX-License-Identifier: ISC
 
 import argparse
+import re
+import signal
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from queue import Empty, Full, Queue
+from urllib.parse import urlparse
 
 from rich.console import Console
-from sparqlite import SPARQLClient
+from sparqlite import EndpointError, SPARQLClient
 from tqdm import tqdm
 
 from piccione.upload.cache_manager import CacheManager
+from piccione.upload.directory_watcher import DirectoryWatcher
+from piccione.upload.sparql_validator import has_pragmas, is_data_only, validate_sparql_update
+from piccione.upload.virtuoso import VIRTUOSO_BATCH_SIZE, VIRTUOSO_PRAGMAS, IsqlConnection, bulk_load, is_data_file
 
 console = Console()
 
+IDLE_FLUSH_INTERVAL = 0.1
+FILE_ORDERS = ("discovered", "largest", "smallest")
+
+
+@dataclass(frozen=True)
+class EndpointProfile:
+    pragmas: tuple[str, ...] = ()
+    batch_size: int = 1
+
+
+ENDPOINT_PROFILES: dict[str, EndpointProfile] = {
+    "generic": EndpointProfile(),
+    "virtuoso": EndpointProfile(pragmas=VIRTUOSO_PRAGMAS, batch_size=VIRTUOSO_BATCH_SIZE),
+}
+
 
 def save_failed_query_file(filename: str, failed_file: str | Path) -> None:
     with Path(failed_file).open("a", encoding="utf8") as f:
@@ -25,8 +53,351 @@ def remove_stop_file(stop_file: str | Path) -> None:
         console.print(f"Existing stop file {stop_file} has been removed.")
 
 
+def build_update(queries: list[str], pragmas: tuple[str, ...] = ()) -> str:
+    # Operations are joined on their own line so that a trailing comment cannot swallow the separator.
+    operations = "\n;\n".join(query.rstrip().rstrip(";") for query in queries)
+    return "\n".join([*pragmas, operations]) if pragmas else operations
+
+
+@dataclass(frozen=True)
+class TimeoutPolicy:
+    base: float
+    per_mb: float = 0.0
+
+    def for_payload(self, payload: str) -> float:
+        return self.base + self.per_mb * len(payload.encode("utf-8")) / 1048576
+
+
+@dataclass
+class Replica:
+    endpoint: str
+    failed_file: Path
+    cache_manager: CacheManager | None
+    pending: set[str]
+    queue: Queue[tuple[str, str] | None]
+    timeout_file: Path | None = None
+    timeouts: TimeoutPolicy | None = None
+    progress: tqdm | None = None
+    # Once the lag buffer overflows, the replica reads its remaining files from disk by itself.
+    deferred: deque[str] = field(default_factory=deque)
+
+    def offer(self, file: str, query: str) -> None:
+        if not self.deferred:
+            try:
+                self.queue.put_nowait((file, query))
+            except Full:
+                pass
+            else:
+                return
+        self.deferred.append(file)
+
+    def done(self, file: str) -> None:
+        if self.cache_manager is not None:
+            self.cache_manager.add(file)
+        if self.progress is not None:
+            self.progress.update(1)
+
+    def failed(self, file: str) -> None:
+        save_failed_query_file(file, self.failed_file)
+        if self.progress is not None:
+            self.progress.update(1)
+
+    def timed_out(self, file: str) -> None:
+        save_failed_query_file(file, self.timeout_file or self.failed_file)
+        if self.progress is not None:
+            self.progress.update(1)
+
+    def next_deferred(self) -> str | None:
+        try:
+            return self.deferred.popleft()
+        except IndexError:
+            return None
+
+
+def stop_requested(stop_file: str | Path, stop_event: threading.Event | None = None) -> bool:
+    return (stop_event is not None and stop_event.is_set()) or Path(stop_file).exists()
+
+
+def order_files(folder: str | Path, files: list[str], order: str) -> list[str]:
+    if order == "discovered":
+        return files
+    sizes = {f: (Path(folder) / f).stat().st_size for f in files}
+    return sorted(files, key=sizes.__getitem__, reverse=order == "largest")
+
+
+def update_or_time_out(client: SPARQLClient, update: str) -> None:
+    try:
+        client.update(update)
+    except EndpointError as e:
+        if str(e).startswith("Timeout error"):
+            raise TimeoutError(str(e)) from e
+        raise
+
+
+def run_update(client: SPARQLClient, update: str, timeouts: TimeoutPolicy | None) -> None:
+    if timeouts is None:
+        client.update(update)
+        return
+    client.timeout = timeouts.for_payload(update)
+    # The first attempt is not retried, so that a timeout is reported at once instead of resent as-is.
+    max_retries = client.max_retries
+    client.max_retries = 0
+    try:
+        update_or_time_out(client, update)
+    except TimeoutError:
+        raise
+    except EndpointError:
+        # Other errors get the client's retries, but a retry that times out is still reported as a timeout.
+        client.max_retries = max_retries
+        update_or_time_out(client, update)
+    finally:
+        client.max_retries = max_retries
+
+
+def replica_failed_file(failed_file: str | Path, endpoint: str) -> Path:
+    parsed = urlparse(endpoint)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{parsed.netloc}{parsed.path}").strip("_")
+    path = Path(failed_file)
+    return path.with_name(f"{path.stem}.{slug}{path.suffix}")
+
+
+def read_query(file_path: Path) -> str:
+    with file_path.open(encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def send_batch(client: SPARQLClient, batch: list[tuple[str, str]], pragmas: tuple[str, ...], replica: Replica) -> None:
+    if len(batch) > 1:
+        try:
+            run_update(client, build_update([query for _, query in batch], pragmas), replica.timeouts)
+        except Exception as e:  # noqa: BLE001
+            console.print(f"Batch of {len(batch)} files failed ({e}), retrying them one by one")
+        else:
+            for file, _ in batch:
+                replica.done(file)
+            return
+
+    for file, query in batch:
+        send_file(client, file, build_update([query], () if has_pragmas(query) else pragmas), replica)
+
+
+def send_file(client: SPARQLClient, file: str, update: str, replica: Replica) -> None:
+    try:
+        run_update(client, update, replica.timeouts)
+    except TimeoutError as e:
+        console.print(f"Timed out executing {file}: {e}")
+        replica.timed_out(file)
+    except Exception as e:  # noqa: BLE001
+        console.print(f"Failed to execute {file}: {e}")
+        replica.failed(file)
+    else:
+        replica.done(file)
+
+
+def send_queries(
+    client: SPARQLClient,
+    queries: Iterable[tuple[str, str] | None],
+    profile: EndpointProfile,
+    batch_size: int,
+    replica: Replica,
+) -> None:
+    batch: list[tuple[str, str]] = []
+    for item in queries:
+        # None means the stream is idle: flush instead of waiting for a full batch.
+        if item is None:
+            send_batch(client, batch, profile.pragmas, replica)
+            batch = []
+            continue
+        file, query = item
+        # Files carrying their own pragmas cannot share a request with other files. Neither can updates other
+        # than INSERT DATA and DELETE DATA: with row autocommit a failed batch keeps the operations before the
+        # failing one, and only DATA operations can be sent again one by one without being applied twice.
+        if has_pragmas(query) or not is_data_only(query):
+            send_batch(client, batch, profile.pragmas, replica)
+            batch = []
+            send_batch(client, [(file, query)], profile.pragmas, replica)
+            continue
+        batch.append((file, query))
+        if len(batch) >= batch_size:
+            send_batch(client, batch, profile.pragmas, replica)
+            batch = []
+    send_batch(client, batch, profile.pragmas, replica)
+
+
+def run_replica(
+    replica: Replica,
+    folder: str | Path,
+    profile: EndpointProfile,
+    batch_size: int,
+    stop_file: str | Path,
+    stop_event: threading.Event | None = None,
+) -> None:
+    def stream() -> Iterator[tuple[str, str] | None]:
+        stopped = False
+        # Keep draining after a stop request so that the producer never blocks on a full buffer.
+        while True:
+            try:
+                item = replica.queue.get(block=not replica.deferred, timeout=IDLE_FLUSH_INTERVAL)
+            except Empty:
+                file = replica.next_deferred()
+                if file is None:
+                    yield None
+                    continue
+                item = (file, read_query(Path(folder) / file))
+            if item is None:
+                break
+            stopped = stopped or stop_requested(stop_file, stop_event)
+            if not stopped:
+                yield item
+        while not (stopped or stop_requested(stop_file, stop_event)):
+            file = replica.next_deferred()
+            if file is None:
+                return
+            yield file, read_query(Path(folder) / file)
+
+    with SPARQLClient(replica.endpoint, max_retries=3, backoff_factor=5) as client:
+        send_queries(client, stream(), profile, batch_size, replica)
+
+
+def dispatch_files(
+    folder: str | Path,
+    files: list[str],
+    replicas: list[Replica],
+    *,
+    stop_file: str | Path,
+    validate: bool,
+    stop_event: threading.Event | None = None,
+) -> None:
+    for file in files:
+        if stop_requested(stop_file, stop_event):
+            console.print(f"\nStop file {stop_file} detected. Interrupting the process...")
+            return
+
+        targets = [replica for replica in replicas if file in replica.pending]
+        query = read_query(Path(folder) / file)
+
+        if not query:
+            for replica in targets:
+                replica.done(file)
+            continue
+
+        syntax_error = validate_sparql_update(query) if validate else None
+        if syntax_error is not None:
+            console.print(f"Invalid syntax in {file}: {syntax_error}")
+            for replica in targets:
+                replica.failed(file)
+            continue
+
+        for replica in targets:
+            replica.offer(file, query)
+
+
+@contextmanager
+def running_replicas(
+    folder: str | Path,
+    replicas: list[Replica],
+    profile: EndpointProfile,
+    batch_size: int,
+    *,
+    stop_file: str | Path,
+    stop_event: threading.Event | None = None,
+    workers: int = 1,
+) -> Iterator[list[Future[None]]]:
+    with ThreadPoolExecutor(max_workers=len(replicas) * workers) as executor:
+        replica_futures = [
+            [
+                executor.submit(run_replica, replica, folder, profile, batch_size, stop_file, stop_event)
+                for _ in range(workers)
+            ]
+            for replica in replicas
+        ]
+        futures = [future for group in replica_futures for future in group]
+        try:
+            yield futures
+        finally:
+            for replica, group in zip(replicas, replica_futures, strict=True):
+                close_replica(replica, group)
+        for future in futures:
+            future.result()
+
+
+def close_replica(replica: Replica, futures: list[Future[None]]) -> None:
+    # One end marker per worker, as long as some worker is still alive to consume it.
+    for _ in futures:
+        while not all(future.done() for future in futures):
+            try:
+                replica.queue.put(None, timeout=1)
+            except Full:
+                continue
+            break
+
+
+def create_replicas(  # noqa: PLR0913
+    endpoints: list[str],
+    files: list[str],
+    *,
+    failed_file: str | Path,
+    redis_host: str | None,
+    redis_port: int,
+    redis_db: int,
+    max_lag: int,
+    timeout_file: str | Path | None = None,
+    timeouts: TimeoutPolicy | None = None,
+) -> list[Replica]:
+    replicas: list[Replica] = []
+    for index, endpoint in enumerate(endpoints):
+        # The first endpoint keeps the plain key and journals, so adding a replica to an ongoing job
+        # does not make the primary send its processed files again.
+        primary = index == 0
+        cache_manager = None
+        if redis_host is not None:
+            cache_manager = CacheManager(
+                redis_host=redis_host,
+                redis_port=redis_port,
+                redis_db=redis_db,
+                key=CacheManager.REDIS_KEY if primary else f"{CacheManager.REDIS_KEY}:{endpoint}",
+            )
+        timed_out_file = None
+        if timeout_file is not None:
+            timed_out_file = Path(timeout_file) if primary else replica_failed_file(timeout_file, endpoint)
+        replicas.append(
+            Replica(
+                endpoint=endpoint,
+                failed_file=Path(failed_file) if primary else replica_failed_file(failed_file, endpoint),
+                cache_manager=cache_manager,
+                pending={f for f in files if cache_manager is None or f not in cache_manager},
+                queue=Queue(maxsize=max_lag),
+                timeout_file=timed_out_file,
+                timeouts=timeouts,
+            ),
+        )
+    return replicas
+
+
+def list_files(folder: str | Path, *, data: bool = False) -> list[str]:
+    return [f.name for f in Path(folder).iterdir() if (is_data_file(f.name) if data else f.name.endswith(".sparql"))]
+
+
+def load_data_files(isql: IsqlConnection, folder: str | Path, replica: Replica, graph: str) -> None:
+    cache_manager = replica.cache_manager
+    data_files = [f for f in list_files(folder, data=True) if cache_manager is None or f not in cache_manager]
+    if not data_files:
+        return
+    console.print(f"Bulk loading {len(data_files)} data files through isql...")
+    try:
+        failed = bulk_load(isql, folder, data_files, graph)
+    except RuntimeError as e:
+        console.print(f"Bulk load failed: {e}")
+        failed = set(data_files)
+    for file in data_files:
+        if file in failed:
+            save_failed_query_file(file, replica.failed_file)
+        elif cache_manager is not None:
+            cache_manager.add(file)
+
+
 def upload_sparql_updates(  # noqa: PLR0913
-    endpoint: str,
+    endpoint: str | list[str],
     folder: str | Path,
     *,
     failed_file: str | Path = "failed_queries.txt",
@@ -36,53 +407,151 @@ def upload_sparql_updates(  # noqa: PLR0913
     redis_db: int = 4,
     description: str = "Processing files",
     show_progress: bool = True,
+    validate: bool = True,
+    profile: str = "generic",
+    batch_size: int | None = None,
+    isql: IsqlConnection | None = None,
+    data_graph: str = "",
+    max_lag: int = 100,
+    order: str = "discovered",
+    workers: int = 1,
+    timeout: float | None = None,
+    timeout_per_mb: float = 0.0,
+    timeout_file: str | Path = "timed_out_queries.txt",
 ) -> None:
+    endpoints = [endpoint] if isinstance(endpoint, str) else list(endpoint)
+    if isql is not None and len(endpoints) > 1:
+        msg = "Bulk loading through isql supports a single endpoint"
+        raise ValueError(msg)
+
     if not Path(folder).exists():
         return
 
-    cache_manager = None
-    if redis_host is not None:
-        cache_manager = CacheManager(
-            redis_host=redis_host,
-            redis_port=redis_port,
-            redis_db=redis_db,
-        )
+    endpoint_profile = ENDPOINT_PROFILES[profile]
+    batch_size = batch_size or endpoint_profile.batch_size
+
+    all_files = list_files(folder)
+    replicas = create_replicas(
+        endpoints,
+        all_files,
+        failed_file=failed_file,
+        redis_host=redis_host,
+        redis_port=redis_port,
+        redis_db=redis_db,
+        max_lag=max_lag,
+        timeout_file=timeout_file,
+        timeouts=TimeoutPolicy(timeout, timeout_per_mb) if timeout is not None else None,
+    )
 
-    all_files = [f.name for f in Path(folder).iterdir() if f.name.endswith(".sparql")]
-    files_to_process = [f for f in all_files if f not in cache_manager] if cache_manager is not None else all_files
+    if isql is not None:
+        load_data_files(isql, folder, replicas[0], data_graph)
 
+    replicas = [replica for replica in replicas if replica.pending]
+    files_to_process = [f for f in all_files if any(f in replica.pending for replica in replicas)]
     if not files_to_process:
         return
+    files_to_process = order_files(folder, files_to_process, order)
 
-    iterator = tqdm(files_to_process, desc=description) if show_progress else files_to_process
-    with SPARQLClient(endpoint, max_retries=3, backoff_factor=5) as client:
-        for file in iterator:
-            if Path(stop_file).exists():
-                console.print(f"\nStop file {stop_file} detected. Interrupting the process...")
-                break
+    if show_progress:
+        for position, replica in enumerate(replicas):
+            label = f"{description} ({replica.endpoint})" if len(replicas) > 1 else description
+            replica.progress = tqdm(total=len(replica.pending), desc=label, position=position)
 
-            file_path = Path(folder) / file
+    try:
+        with running_replicas(folder, replicas, endpoint_profile, batch_size, stop_file=stop_file, workers=workers):
+            dispatch_files(folder, files_to_process, replicas, stop_file=stop_file, validate=validate)
+    finally:
+        for replica in replicas:
+            if replica.progress is not None:
+                replica.progress.close()
 
-            with file_path.open(encoding="utf-8") as f:
-                query = f.read().strip()
 
-            if not query:
-                if cache_manager is not None:
-                    cache_manager.add(file)
-                continue
+def watch_sparql_updates(  # noqa: PLR0913
+    endpoint: str | list[str],
+    folder: str | Path,
+    *,
+    failed_file: str | Path = "failed_queries.txt",
+    stop_file: str | Path = ".stop_upload",
+    redis_host: str | None = None,
+    redis_port: int = 6379,
+    redis_db: int = 4,
+    validate: bool = True,
+    profile: str = "generic",
+    batch_size: int | None = None,
+    max_lag: int = 100,
+    order: str = "discovered",
+    workers: int = 1,
+    timeout: float | None = None,
+    timeout_per_mb: float = 0.0,
+    timeout_file: str | Path = "timed_out_queries.txt",
+    poll_interval: float = 0.5,
+    stop_event: threading.Event | None = None,
+) -> None:
+    endpoints = [endpoint] if isinstance(endpoint, str) else list(endpoint)
+    endpoint_profile = ENDPOINT_PROFILES[profile]
+    stop_event = stop_event or threading.Event()
 
-            try:
-                client.update(query)
-                if cache_manager is not None:
-                    cache_manager.add(file)
-            except Exception as e:  # noqa: BLE001
-                console.print(f"Failed to execute {file}: {e}")
-                save_failed_query_file(file, failed_file)
+    previous_handlers = {}
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous_handlers[signum] = signal.signal(signum, lambda *_: stop_event.set())
+
+    try:
+        with DirectoryWatcher(folder, ".sparql", poll_interval) as watcher:
+            initial_files = list_files(folder)
+            replicas = create_replicas(
+                endpoints,
+                initial_files,
+                failed_file=failed_file,
+                redis_host=redis_host,
+                redis_port=redis_port,
+                redis_db=redis_db,
+                max_lag=max_lag,
+                timeout_file=timeout_file,
+                timeouts=TimeoutPolicy(timeout, timeout_per_mb) if timeout is not None else None,
+            )
+            console.print(f"Watching {folder} for new files ({watcher.backend})...")
+            with running_replicas(
+                folder,
+                replicas,
+                endpoint_profile,
+                batch_size or endpoint_profile.batch_size,
+                stop_file=stop_file,
+                stop_event=stop_event,
+                workers=workers,
+            ) as futures:
+                seen = set(initial_files)
+                new_files = [f for f in initial_files if any(f in replica.pending for replica in replicas)]
+                while not stop_requested(stop_file, stop_event) and not any(f.done() for f in futures):
+                    dispatch_files(
+                        folder,
+                        order_files(folder, new_files, order),
+                        replicas,
+                        stop_file=stop_file,
+                        validate=validate,
+                        stop_event=stop_event,
+                    )
+                    new_files = [f for f in watcher.poll(poll_interval) if f not in seen]
+                    seen.update(new_files)
+                    for replica in replicas:
+                        cache_manager = replica.cache_manager
+                        replica.pending.update(f for f in new_files if cache_manager is None or f not in cache_manager)
+        console.print("Watch mode stopped.")
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
 
 
 def main() -> None:  # pragma: no cover
     parser = argparse.ArgumentParser(description="Execute SPARQL update queries on a triple store.")
     parser.add_argument("endpoint", type=str, help="Endpoint URL of the triple store")
+    parser.add_argument(
+        "--replica",
+        type=str,
+        action="append",
+        default=[],
+        help="Additional endpoint receiving the same updates (repeatable)",
+    )
     parser.add_argument(
         "folder",
         type=str,
@@ -98,19 +567,129 @@ def main() -> None:  # pragma: no cover
     parser.add_argument("--redis_host", type=str, help="Redis host for caching")
     parser.add_argument("--redis_port", type=int, help="Redis port")
     parser.add_argument("--redis_db", type=int, help="Redis database number")
+    parser.add_argument(
+        "--no_validate",
+        action="store_true",
+        help="Skip the local syntax check and send every file to the endpoint",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(ENDPOINT_PROFILES),
+        default="generic",
+        help="Endpoint profile (default: generic)",
+    )
+    parser.add_argument("--batch_size", type=int, help="Number of files sent in a single update request")
+    parser.add_argument("--isql_host", type=str, help="Virtuoso isql host, enables bulk loading of data files")
+    parser.add_argument("--isql_port", type=int, default=1111, help="Virtuoso isql port")
+    parser.add_argument("--isql_user", type=str, default="dba", help="Virtuoso isql user")
+    parser.add_argument("--isql_password", type=str, default="dba", help="Virtuoso isql password")
+    parser.add_argument(
+        "--isql_server_folder",
+        type=str,
+        help="Path of the folder as seen by the Virtuoso server (default: same as folder)",
+    )
+    parser.add_argument("--data_graph", type=str, default="", help="Target graph for bulk loaded triple files")
+    parser.add_argument(
+        "--order",
+        choices=FILE_ORDERS,
+        default="discovered",
+        help="Order in which files are sent: as discovered, largest first or smallest first (default: discovered)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent requests per endpoint (default: 1)")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Base per-file timeout in seconds; timed-out files are not retried and go to the timeout file",
+    )
+    parser.add_argument(
+        "--timeout_per_mb",
+        type=float,
+        default=0.0,
+        help="Seconds added to the per-file timeout for each MB of payload (default: 0)",
+    )
+    parser.add_argument(
+        "--timeout_file",
+        type=str,
+        default="timed_out_queries.txt",
+        help="Path to the file recording timed-out queries",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and upload new files as they appear in the folder",
+    )
+    parser.add_argument(
+        "--poll_interval",
+        type=float,
+        default=0.5,
+        help="Seconds between checks for new files and for the stop file in watch mode (default: 0.5)",
+    )
+    parser.add_argument(
+        "--max_lag",
+        type=int,
+        default=100,
+        help="Queries buffered in memory per replica before a slow replica reads from disk (default: 100)",
+    )
 
     args = parser.parse_args()
 
     remove_stop_file(args.stop_file)
 
+    isql = None
+    if args.isql_host is not None:
+        isql = IsqlConnection(
+            password=args.isql_password,
+            host=args.isql_host,
+            port=args.isql_port,
+            user=args.isql_user,
+            server_folder=args.isql_server_folder,
+        )
+
+    endpoints = [args.endpoint, *args.replica] if args.replica else args.endpoint
+
+    if args.watch:
+        if isql is not None:
+            parser.error("--watch cannot be combined with bulk loading through isql")
+        watch_sparql_updates(
+            endpoints,
+            args.folder,
+            failed_file=args.failed_file,
+            stop_file=args.stop_file,
+            redis_host=args.redis_host,
+            redis_port=args.redis_port or 6379,
+            redis_db=args.redis_db or 4,
+            validate=not args.no_validate,
+            profile=args.profile,
+            batch_size=args.batch_size,
+            max_lag=args.max_lag,
+            order=args.order,
+            workers=args.workers,
+            timeout=args.timeout,
+            timeout_per_mb=args.timeout_per_mb,
+            timeout_file=args.timeout_file,
+            poll_interval=args.poll_interval,
+        )
+        return
+
     upload_sparql_updates(
-        args.endpoint,
+        endpoints,
         args.folder,
         failed_file=args.failed_file,
         stop_file=args.stop_file,
         redis_host=args.redis_host,
         redis_port=args.redis_port or 6379,
         redis_db=args.redis_db or 4,
+        validate=not args.no_validate,
+        profile=args.profile,
+        batch_size=args.batch_size,
+        isql=isql,
+        data_graph=args.data_graph,
+        max_lag=args.max_lag,
+        order=args.order,
+        workers=args.workers,
+        timeout=args.timeout,
+        timeout_per_mb=args.timeout_per_mb,
+        timeout_file=args.timeout_file,
     )
 
 
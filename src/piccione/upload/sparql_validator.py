@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+"""
+Local syntax pre-check for SPARQL 1.1 Update files.
+
+The check works at the tokenizer level: comments, string literals and IRIs are
+skipped, brackets must balance, and every operation must start with an update
+form. Vendor DEFINE pragmas in the prologue are skipped. It does not replace
+the server-side parser, but it catches truncated or malformed files without a
+round-trip to the endpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+from rich.console import Console
+
+console = Console()
+
+UPDATE_FORMS = frozenset({"INSERT", "DELETE", "LOAD", "CLEAR", "CREATE", "DROP", "COPY", "MOVE", "ADD", "WITH"})
+QUERY_FORMS = frozenset({"SELECT", "CONSTRUCT", "ASK", "DESCRIBE"})
+BRACKET_PAIRS = {"}": "{", ")": "(", "]": "["}
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>\#[^\n]*)
+    |(?P<string>'''(?:[^'\\]|\\.|'(?!''))*'''|\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+        |'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")
+    |(?P<unterminated>['"])
+    |(?P<iri><[^<>"{}|^`\\\s]*>)
+    |(?P<open>[{(\[])
+    |(?P<close>[})\]])
+    |(?P<separator>;)
+    |(?P<number>[+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    |(?P<word>(?:[A-Za-z_](?:[\w\-.]*[\w\-])?)?:(?:[\w\-:%.]*[\w\-:%])?|[A-Za-z_](?:[\w\-.]*[\w\-])?)
+    |(?P<space>\s+)
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def _line_of(text: str, position: int) -> int:
+    return text.count("\n", 0, position) + 1
+
+
+def _skip_prologue(words: list[tuple[str, int]]) -> int:
+    index = 0
+    # Vendor pragmas such as Virtuoso's "DEFINE sql:log-enable 3" take a name and a value, like PREFIX.
+    while index < len(words) and words[index][0].upper() in ("PREFIX", "BASE", "DEFINE"):
+        index += 2 if words[index][0].upper() == "BASE" else 3
+    return index
+
+
+def _check_operation(words: list[tuple[str, int]], query: str) -> str | None:
+    index = _skip_prologue(words)
+    if index >= len(words):
+        return None
+    keyword, position = words[index]
+    keyword = keyword.upper()
+    if keyword in QUERY_FORMS:
+        return f"Line {_line_of(query, position)}: {keyword} is a query form, not an update operation"
+    if keyword not in UPDATE_FORMS:
+        return f"Line {_line_of(query, position)}: expected an update operation, found {words[index][0]!r}"
+    return None
+
+
+def _significant_tokens(query: str) -> Iterator[tuple[str, str, int]]:
+    for match in _TOKEN_RE.finditer(query):
+        kind = match.lastgroup
+        if kind is not None and kind not in ("comment", "space"):
+            yield kind, match.group(), match.start()
+
+
+def _check_bracket(stack: list[tuple[str, int]], text: str, position: int, query: str) -> str | None:
+    if text not in BRACKET_PAIRS:
+        stack.append((text, position))
+        return None
+    if not stack:
+        return f"Line {_line_of(query, position)}: unexpected {text!r}"
+    opener, opener_position = stack.pop()
+    if opener != BRACKET_PAIRS[text]:
+        return (
+            f"Line {_line_of(query, position)}: {text!r} does not match "
+            f"{opener!r} opened on line {_line_of(query, opener_position)}"
+        )
+    return None
+
+
+def has_pragmas(query: str) -> bool:
+    depth = 0
+    for kind, text, _ in _significant_tokens(query):
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+        elif not depth and kind == "word" and text.upper() == "DEFINE":
+            return True
+    return False
+
+
+def is_data_only(query: str) -> bool:
+    depth = 0
+    operations: list[list[tuple[str, int]]] = [[]]
+    for kind, text, position in _significant_tokens(query):
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+        elif depth:
+            continue
+        elif kind == "separator":
+            operations.append([])
+        else:
+            operations[-1].append((text, position))
+    for words in operations:
+        index = _skip_prologue(words)
+        keywords = " ".join(word.upper() for word, _ in words[index : index + 2])
+        if keywords and keywords not in ("INSERT DATA", "DELETE DATA"):
+            return False
+    return True
+
+
+def validate_sparql_update(query: str) -> str | None:
+    stack: list[tuple[str, int]] = []
+    operation_words: list[tuple[str, int]] = []
+    expect_data_block = False
+    previous = ""
+
+    for kind, text, position in _significant_tokens(query):
+        error = None
+        if kind == "unterminated":
+            error = f"Line {_line_of(query, position)}: unterminated string literal"
+        elif expect_data_block and text != "{":
+            error = f"Line {_line_of(query, position)}: expected '{{' after DATA, found {text!r}"
+        elif kind in ("open", "close"):
+            error = _check_bracket(stack, text, position, query)
+        elif kind == "separator" and not stack:
+            error = _check_operation(operation_words, query)
+            operation_words = []
+        elif not stack:
+            operation_words.append((text, position))
+        if error is not None:
+            return error
+        # DATA is only a keyword right after a top-level INSERT or DELETE; elsewhere it can be a local name.
+        expect_data_block = (
+            not stack and kind == "word" and text.upper() == "DATA" and previous.upper() in ("INSERT", "DELETE")
+        )
+        previous = text if not stack else ""
+
+    if expect_data_block:
+        return "Unexpected end of input: expected '{' after DATA"
+    if stack:
+        opener, opener_position = stack[-1]
+        return f"Unexpected end of input: {opener!r} opened on line {_line_of(query, opener_position)} is never closed"
+    return _check_operation(operation_words, query)
+
+
+def validate_file(file_path: str | Path) -> str | None:
+    with Path(file_path).open(encoding="utf-8") as f:
+        return validate_sparql_update(f.read())
+
+
+def validate_folder(folder: str | Path, workers: int | None = None) -> dict[str, str]:
+    files = sorted(f for f in Path(folder).iterdir() if f.name.endswith(".sparql"))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(validate_file, files, chunksize=64)
+        return {f.name: error for f, error in zip(files, results, strict=True) if error is not None}
+
+
+def main() -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        description="Check the syntax of SPARQL update files without contacting an endpoint.",
+    )
+    parser.add_argument("folder", type=str, help="Path to the folder containing SPARQL update query files")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    invalid = validate_folder(args.folder, args.workers)
+    for filename, error in sorted(invalid.items()):
+        console.print(f"{filename}: {error}")
+    console.print(f"{len(invalid)} invalid file(s)")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
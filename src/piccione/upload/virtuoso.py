@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+# Autocommit every row and skip the transaction log: large updates no longer
+# hit the transaction size limit and are not written twice.
+VIRTUOSO_PRAGMAS = ("DEFINE sql:log-enable 3",)
+VIRTUOSO_BATCH_SIZE = 20
+
+DATA_FILE_SUFFIXES = (".nt", ".nq", ".ttl", ".trig", ".n3", ".rdf", ".owl", ".xml")
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz")
+LOADED_STATE = 2
+
+
+@dataclass(frozen=True)
+class IsqlConnection:
+    password: str
+    host: str = "localhost"
+    port: int = 1111
+    user: str = "dba"
+    command: tuple[str, ...] = ("isql",)
+    server_folder: str | None = None
+
+
+def is_data_file(filename: str) -> bool:
+    name = filename.lower()
+    for suffix in COMPRESSION_SUFFIXES:
+        name = name.removesuffix(suffix)
+    return name.endswith(DATA_FILE_SUFFIXES)
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def run_isql(connection: IsqlConnection, sql: str) -> str:
+    cmd = [
+        *connection.command,
+        f"{connection.host}:{connection.port}",
+        connection.user,
+        connection.password,
+        f"exec={sql}",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)  # noqa: S603
+    if result.returncode != 0 or "*** Error" in result.stdout or "*** Error" in result.stderr:
+        msg = f"isql command failed: {(result.stderr or result.stdout).strip()}"
+        raise RuntimeError(msg)
+    return result.stdout
+
+
+def bulk_load(connection: IsqlConnection, folder: str | Path, files: list[str], graph: str = "") -> set[str]:
+    server_folder = connection.server_folder or str(Path(folder).absolute())
+    server_paths = {f"{server_folder.rstrip('/')}/{name}": name for name in files}
+    path_list = ", ".join(_sql_string(path) for path in server_paths)
+
+    register = " ".join(f"ld_add({_sql_string(path)}, {_sql_string(graph)});" for path in server_paths)
+    run_isql(connection, f"DELETE FROM DB.DBA.LOAD_LIST WHERE ll_file IN ({path_list}); {register}")  # noqa: S608
+    run_isql(connection, "rdf_loader_run(); checkpoint;")
+
+    output = run_isql(
+        connection,
+        "SELECT ll_file FROM DB.DBA.LOAD_LIST "  # noqa: S608
+        f"WHERE ll_file IN ({path_list}) AND (ll_state <> {LOADED_STATE} OR ll_error IS NOT NULL);",
+    )
+    return {server_paths[line.strip()] for line in output.splitlines() if line.strip() in server_paths}
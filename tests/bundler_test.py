@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from piccione.upload.bundler import BundleOptions, bundle_files, plan_bundles
+
+
+def make_files(folder: Path, sizes: dict[str, int]) -> list[str]:
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, size in sizes.items():
+        (folder / name).write_bytes(name.encode()[:1] * size)
+    return [str(folder / name) for name in sizes]
+
+
+class TestPlanBundles:
+    def test_small_files_are_grouped_up_to_target_size(self, tmp_path: Path) -> None:
+        files = make_files(tmp_path, {"big": 100, "a": 10, "b": 10, "c": 10, "d": 30})
+
+        large, groups = plan_bundles(files, threshold=50, target_size=25)
+
+        assert large == [str(tmp_path / "big")]
+        assert groups == [
+            [str(tmp_path / "a"), str(tmp_path / "b")],
+            [str(tmp_path / "c")],
+            [str(tmp_path / "d")],
+        ]
+
+
+class TestBundleFiles:
+    def test_tar_bundles_and_manifest(self, tmp_path: Path) -> None:
+        files = make_files(tmp_path / "data", {"big.bin": 100, "a.txt": 10, "b.txt": 10})
+        files += make_files(tmp_path / "other", {"a.txt": 5})
+        options = BundleOptions(directory=tmp_path / "bundles", threshold=50, target_size=1000)
+
+        uploads = bundle_files(files, options)
+
+        archive = tmp_path / "bundles" / "bundle-0000.tar"
+        assert uploads == [str(tmp_path / "data" / "big.bin"), str(archive)]
+        with tarfile.open(archive) as tar:
+            assert tar.getnames() == ["a.txt", "b.txt", "2/a.txt"]
+            member = tar.extractfile("2/a.txt")
+            assert member is not None
+            assert member.read() == b"a" * 5
+        manifest = json.loads((tmp_path / "bundles" / "bundle-manifest.json").read_text())
+        assert manifest["files"][str(tmp_path / "other" / "a.txt")] == {
+            "archive": "bundle-0000.tar",
+            "member": "2/a.txt",
+        }
+        assert str(tmp_path / "data" / "big.bin") not in manifest["files"]
+
+    def test_zip_bundles(self, tmp_path: Path) -> None:
+        files = make_files(tmp_path / "data", {"a.txt": 10, "b.txt": 20})
+        options = BundleOptions(directory=tmp_path / "bundles", threshold=50, archive_format="zip")
+
+        uploads = bundle_files(files, options)
+
+        with zipfile.ZipFile(uploads[0]) as archive:
+            assert archive.namelist() == ["a.txt", "b.txt"]
+            assert archive.read("b.txt") == b"b" * 20
+
+    def test_unchanged_bundles_are_not_rewritten(self, tmp_path: Path) -> None:
+        files = make_files(tmp_path / "data", {"a.txt": 10, "b.txt": 10})
+        options = BundleOptions(directory=tmp_path / "bundles", threshold=50)
+        first = Path(bundle_files(files, options)[0]).read_bytes()
+
+        with patch("piccione.upload.bundler.write_tar") as mock_write:
+            bundle_files(files, options)
+        mock_write.assert_not_called()
+
+        (tmp_path / "bundles" / "bundle-0000.tar").unlink()
+        assert Path(bundle_files(files, options)[0]).read_bytes() == first
+
+    def test_unknown_format_is_rejected(self, tmp_path: Path) -> None:
+        options = BundleOptions(directory=tmp_path / "bundles", archive_format="rar")
+
+        with pytest.raises(ValueError, match="rar"):
+            bundle_files([], options)
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+import hashlib
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from piccione.digest_cache import DigestCache, compute_md5
+
+
+class TestComputeMd5:
+    def test_returns_md5_and_size(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(b"x" * 3000)
+
+        assert compute_md5(test_file, chunk_size=1024) == (
+            hashlib.md5(b"x" * 3000, usedforsecurity=False).hexdigest(),
+            3000,
+        )
+
+
+class TestDigestCache:
+    def test_unchanged_file_is_hashed_once(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+        cache = DigestCache()
+
+        with patch("piccione.digest_cache.compute_md5", wraps=compute_md5) as mock_compute:
+            first = cache.get(test_file)
+            second = cache.get(test_file)
+
+        assert first == second == (hashlib.md5(b"content", usedforsecurity=False).hexdigest(), 7)
+        assert mock_compute.call_count == 1
+
+    def test_modified_file_is_hashed_again(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+        cache = DigestCache()
+        cache.get(test_file)
+
+        test_file.write_bytes(b"changed")
+        stat = test_file.stat()
+        os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get(test_file) == (hashlib.md5(b"changed", usedforsecurity=False).hexdigest(), 7)
+
+    def test_digests_persist_across_runs(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+        cache_file = tmp_path / "cache" / "digests.json"
+
+        cache = DigestCache(cache_file)
+        expected = cache.get(test_file)
+        cache.save()
+
+        with patch("piccione.digest_cache.compute_md5") as mock_compute:
+            assert DigestCache(cache_file).get(test_file) == expected
+        mock_compute.assert_not_called()
+
+    def test_save_without_path_writes_nothing(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+        cache = DigestCache()
+        cache.get(test_file)
+        cache.save()
+
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    def test_recorded_digest_is_reused(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+        cache = DigestCache()
+        cache.record(test_file, "0" * 32)
+
+        with patch("piccione.digest_cache.compute_md5") as mock_compute:
+            assert cache.get(test_file) == ("0" * 32, 7)
+        mock_compute.assert_not_called()
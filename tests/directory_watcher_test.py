@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from piccione.upload.directory_watcher import DirectoryWatcher
+
+
+class TestDirectoryWatcher:
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+    def test_inotify_reports_closed_and_moved_files(self, tmp_path: Path) -> None:
+        (tmp_path / "existing.sparql").write_text("old")
+
+        with DirectoryWatcher(tmp_path, ".sparql") as watcher:
+            assert watcher.backend == "inotify"
+            (tmp_path / "new.sparql").write_text("INSERT DATA {}")
+            (tmp_path / "ignored.txt").write_text("other")
+            staged = tmp_path.parent / f"{tmp_path.name}_staged.sparql"
+            staged.write_text("INSERT DATA {}")
+            staged.rename(tmp_path / "moved.sparql")
+
+            assert watcher.poll(1) == ["new.sparql", "moved.sparql"]
+            assert watcher.poll(0) == []
+
+    def test_polling_reports_files_once_they_are_stable(self, tmp_path: Path) -> None:
+        (tmp_path / "existing.sparql").write_text("old")
+
+        with (
+            patch.object(DirectoryWatcher, "_init_inotify", return_value=None),
+            DirectoryWatcher(tmp_path, ".sparql", poll_interval=0) as watcher,
+        ):
+            assert watcher.backend == "polling"
+            (tmp_path / "new.sparql").write_text("INSERT DATA {}")
+
+            assert watcher.poll(0) == []
+            assert watcher.poll(0) == ["new.sparql"]
+            assert watcher.poll(0) == []
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+import hashlib
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from piccione.download.extract import archive_kind, extract_tar_stream, extract_zip_ranges, extraction_dir
+
+MEMBERS = {"data/a.bin": os.urandom(200000), "data/b.bin": os.urandom(50000), "readme.txt": b"hello"}
+
+
+def md5(content: bytes) -> str:
+    return hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+
+class TestArchiveNames:
+    @pytest.mark.parametrize(
+        ("name", "kind", "directory"),
+        [
+            ("dump.tar.gz", "tar", "dump"),
+            ("dump.TGZ", "tar", "dump"),
+            ("dump.tar", "tar", "dump"),
+            ("dump.zip", "zip", "dump"),
+            ("dump.csv", None, "dump.csv"),
+        ],
+    )
+    def test_kind_and_directory(self, name: str, kind: str | None, directory: str) -> None:
+        assert archive_kind(name) == kind
+        assert extraction_dir(Path("out") / name) == Path("out") / directory
+
+
+class TestExtractTarStream:
+    def test_members_are_extracted_and_the_compressed_bytes_hashed(self, tmp_path: Path) -> None:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name, content in MEMBERS.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        compressed = buffer.getvalue()
+        progress = MagicMock()
+
+        digest = extract_tar_stream(MagicMock(raw=io.BytesIO(compressed)), tmp_path, progress)
+
+        assert digest == md5(compressed)
+        assert sum(call.args[0] for call in progress.update.call_args_list) == len(compressed)
+        for name, content in MEMBERS.items():
+            assert (tmp_path / name).read_bytes() == content
+
+
+class TestExtractZipRanges:
+    def test_members_are_read_forward_through_ranges(self, tmp_path: Path) -> None:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, content in MEMBERS.items():
+                archive.writestr(name, content)
+        content = buffer.getvalue()
+        starts: list[int] = []
+
+        def get(_url: str, headers: dict[str, str], **_kwargs: object) -> MagicMock:
+            start = int(headers["Range"].removeprefix("bytes=").removesuffix("-"))
+            starts.append(start)
+            return MagicMock(status_code=206, raw=io.BytesIO(content[start:]))
+
+        digest = extract_zip_ranges(get, "https://example.com/dump.zip", len(content), tmp_path, MagicMock())
+
+        assert digest == md5(content)
+        for name, member in MEMBERS.items():
+            assert (tmp_path / name).read_bytes() == member
+        # After the directory at the end has been read, one stream from the start covers every member.
+        assert starts.count(0) == 1
+        assert len(starts) <= 4
+
+    def test_ignored_range_requests_are_rejected(self, tmp_path: Path) -> None:
+        def get(*_args: object, **_kwargs: object) -> MagicMock:
+            return MagicMock(status_code=200, raw=io.BytesIO(b"whole file"))
+
+        with pytest.raises(ValueError, match="was not honoured"):
+            extract_zip_ranges(get, "https://example.com/dump.zip", 10, tmp_path, MagicMock())
@@ -3,12 +3,80 @@
 # SPDX-License-Identifier: ISC
 
 import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from piccione.download.from_figshare import download_file, get_article_metadata
+from piccione.digest_cache import DigestCache
+from piccione.download.from_figshare import (
+    FigshareFileEntry,
+    ThrottledProgress,
+    download_file,
+    download_files,
+    get_article_metadata,
+    iter_article_files,
+    iter_group_files,
+    part_path,
+    pipe_response,
+    ranges_path,
+    sync_files,
+)
+
+
+@pytest.fixture
+def range_server() -> Iterator[tuple[str, bytes, list[str | None], list[bool]]]:
+    content = os.urandom(100000)
+    requested_ranges: list[str | None] = []
+    honour_ranges = [True]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            requested = self.headers["Range"]
+            requested_ranges.append(requested)
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", requested or "")
+            if match is not None and honour_ranges[0]:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(content) - 1
+                body = content[start : end + 1]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+            else:
+                body = content
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/file.bin", content, requested_ranges, honour_ranges
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def file_entry(name: str, content: bytes, md5: str | None = None, file_id: int = 1) -> FigshareFileEntry:
+    return {
+        "id": file_id,
+        "name": name,
+        "size": len(content),
+        "download_url": f"https://example.com/{name}",
+        "supplied_md5": md5 if md5 is not None else hashlib.md5(content, usedforsecurity=False).hexdigest(),
+    }
 
 
 class TestGetArticleMetadata:
@@ -36,10 +104,59 @@ class TestGetArticleMetadata:
         }
 
         assert mock_get.call_count == 2
-        mock_get.assert_any_call("https://api.figshare.com/v2/articles/123", timeout=30)
+        mock_get.assert_any_call("https://api.figshare.com/v2/articles/123", params=None, timeout=30)
         mock_get.assert_any_call(
             "https://api.figshare.com/v2/articles/123/files",
-            params={"page_size": 1000},
+            params={"page": 1, "page_size": 1000},
+            timeout=30,
+        )
+
+    def test_fetches_every_page_of_files(self) -> None:
+        # Page 1, then a whole window of pages 2-4, then pages 5-7 where page 5 is the short one;
+        # pages 6 and 7 are only requested if they started before page 5 came back.
+        names = [f"file{i}.txt" for i in range(9)]
+
+        def get(_url: str, params: dict[str, int], **_kwargs: object) -> MagicMock:
+            start = (params["page"] - 1) * params["page_size"]
+            response = MagicMock()
+            response.json.return_value = [{"name": name} for name in names[start : start + params["page_size"]]]
+            return response
+
+        with (
+            patch("piccione.download.from_figshare.FILES_PAGE_SIZE", 2),
+            patch("piccione.download.from_figshare.requests.get", side_effect=get) as mock_get,
+        ):
+            files = list(iter_article_files(123, workers=3))
+
+        assert [f["name"] for f in files] == names
+        pages = sorted(call.kwargs["params"]["page"] for call in mock_get.call_args_list)
+        assert pages[:5] == [1, 2, 3, 4, 5]
+        assert set(pages[5:]) <= {6, 7}
+
+
+class TestIterGroupFiles:
+    def test_files_of_every_article_are_listed_under_the_article_id(self) -> None:
+        articles = [{"id": i, "title": f"Article {i}"} for i in range(5)]
+
+        def get(url: str, params: dict[str, int], **_kwargs: object) -> MagicMock:
+            response = MagicMock()
+            if url.endswith("/articles"):
+                start = (params["page"] - 1) * params["page_size"]
+                response.json.return_value = articles[start : start + params["page_size"]]
+            else:
+                response.json.return_value = [{"name": "data.csv"}]
+            return response
+
+        with (
+            patch("piccione.download.from_figshare.FILES_PAGE_SIZE", 2),
+            patch("piccione.download.from_figshare.requests.get", side_effect=get) as mock_get,
+        ):
+            files = list(iter_group_files("collections", 42, workers=3))
+
+        assert sorted(f["name"] for f in files) == [f"{i}/data.csv" for i in range(5)]
+        mock_get.assert_any_call(
+            "https://api.figshare.com/v2/collections/42/articles",
+            params={"page": 1, "page_size": 2},
             timeout=30,
         )
 
@@ -50,7 +167,7 @@ class TestDownloadFile:
         content = b"file content here"
 
         mock_response = MagicMock()
-        mock_response.iter_content.return_value = [content]
+        mock_response.raw = io.BytesIO(content)
 
         with (
             patch("piccione.download.from_figshare.requests.get", return_value=mock_response),
@@ -63,13 +180,34 @@ class TestDownloadFile:
 
         assert output_path.read_bytes() == content
 
+    def test_downloads_empty_file(self, tmp_path: Path) -> None:
+        output_path = tmp_path / "empty.txt"
+
+        with (
+            patch("piccione.download.from_figshare.requests.get", return_value=MagicMock(raw=io.BytesIO())),
+            patch(
+                "piccione.download.from_figshare.tqdm",
+                side_effect=lambda **kw: MagicMock(__enter__=MagicMock(return_value=MagicMock()), __exit__=MagicMock()),
+            ),
+        ):
+            download_file(
+                "https://example.com/file",
+                output_path,
+                0,
+                hashlib.md5(b"", usedforsecurity=False).hexdigest(),
+                segments=1,
+            )
+
+        assert output_path.read_bytes() == b""
+        assert not part_path(output_path).exists()
+
     def test_verifies_md5_when_provided(self, tmp_path: Path) -> None:
         output_path = tmp_path / "downloaded.txt"
         content = b"test content"
         expected_md5 = hashlib.md5(content, usedforsecurity=False).hexdigest()
 
         mock_response = MagicMock()
-        mock_response.iter_content.return_value = [content]
+        mock_response.raw = io.BytesIO(content)
 
         with (
             patch("piccione.download.from_figshare.requests.get", return_value=mock_response),
@@ -88,7 +226,7 @@ class TestDownloadFile:
         wrong_md5 = "0" * 32
 
         mock_response = MagicMock()
-        mock_response.iter_content.return_value = [content]
+        mock_response.raw = io.BytesIO(content)
 
         with (
             patch("piccione.download.from_figshare.requests.get", return_value=mock_response),
@@ -102,3 +240,441 @@ class TestDownloadFile:
 
         actual_md5 = hashlib.md5(content, usedforsecurity=False).hexdigest()
         assert str(exc_info.value) == f"MD5 mismatch: expected {wrong_md5}, got {actual_md5}"
+
+
+class TestDownloadFiles:
+    def test_files_are_downloaded_concurrently_with_one_session(self, tmp_path: Path) -> None:
+        contents = {f"file{i}.txt": f"content {i}".encode() for i in range(3)}
+        files = [file_entry(name, content) for name, content in contents.items()]
+        # Every request waits for the others: this only completes if all three files are in flight at once.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get(url: str, **_kwargs: object) -> MagicMock:
+            barrier.wait()
+            response = MagicMock()
+            response.raw = io.BytesIO(contents[url.rsplit("/", 1)[-1]])
+            return response
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm") as mock_tqdm,
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = get
+            bar = mock_tqdm.return_value.__enter__.return_value
+            bar.total = 0
+            summary = download_files(files, tmp_path, workers=3)
+
+        for name, content in contents.items():
+            assert (tmp_path / name).read_bytes() == content
+        mock_create_session.assert_called_once_with(3 * 4)
+        assert bar.total == sum(len(c) for c in contents.values())
+        assert summary.downloaded == 3
+        assert summary.bytes_downloaded == sum(len(c) for c in contents.values())
+        assert summary.failed == []
+
+    def test_failures_are_isolated(self, tmp_path: Path) -> None:
+        files = [file_entry("good.txt", b"good"), file_entry("bad.txt", b"bad", md5="0" * 32)]
+
+        def get(url: str, **_kwargs: object) -> MagicMock:
+            response = MagicMock()
+            response.raw = io.BytesIO(url.rsplit("/", 1)[-1].split(".", maxsplit=1)[0].encode())
+            return response
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            mock_create_session.return_value.__enter__.return_value.get.side_effect = get
+            summary = download_files(files, tmp_path)
+
+        assert summary.downloaded == 1
+        assert summary.failed == ["bad.txt"]
+        assert (tmp_path / "good.txt").read_bytes() == b"good"
+
+    def test_downloads_start_before_the_listing_is_exhausted(self, tmp_path: Path) -> None:
+        first_started = threading.Event()
+
+        def listing() -> Iterator[FigshareFileEntry]:
+            yield file_entry("first.txt", b"first")
+            assert first_started.wait(timeout=5)
+            yield file_entry("second.txt", b"second")
+
+        def get(url: str, **_kwargs: object) -> MagicMock:
+            first_started.set()
+            return MagicMock(raw=io.BytesIO(b"first" if url.endswith("first.txt") else b"second"))
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            mock_create_session.return_value.__enter__.return_value.get.side_effect = get
+            summary = download_files(listing(), tmp_path)
+
+        assert summary.downloaded == 2
+        assert (tmp_path / "second.txt").read_bytes() == b"second"
+
+    def test_nested_names_are_written_into_subdirectories(self, tmp_path: Path) -> None:
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = lambda *_args, **_kwargs: MagicMock(raw=io.BytesIO(b"data"))
+            summary = download_files([file_entry("7/data.csv", b"data"), file_entry("8/data.csv", b"data")], tmp_path)
+
+        assert summary.downloaded == 2
+        assert (tmp_path / "7" / "data.csv").read_bytes() == b"data"
+        assert (tmp_path / "8" / "data.csv").read_bytes() == b"data"
+
+
+class TestSegmentedDownload:
+    def test_large_file_is_fetched_in_ranges(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, requested_ranges, _ = range_server
+        output = tmp_path / "file.bin"
+        md5 = hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+        with patch("piccione.download.from_figshare.SEGMENT_THRESHOLD", 1000):
+            download_file(url, output, len(content), md5, segments=3)
+
+        assert output.read_bytes() == content
+        assert requested_ranges[0] == "bytes=0-0"
+        assert len(requested_ranges) == 4
+        assert set(requested_ranges[1:]) == {"bytes=0-33333", "bytes=33334-66667", "bytes=66668-99999"}
+
+    def test_falls_back_to_a_single_stream_without_range_support(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, requested_ranges, honour_ranges = range_server
+        honour_ranges[0] = False
+        output = tmp_path / "file.bin"
+        md5 = hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+        with patch("piccione.download.from_figshare.SEGMENT_THRESHOLD", 1000):
+            download_file(url, output, len(content), md5, segments=3)
+
+        assert output.read_bytes() == content
+        assert requested_ranges == ["bytes=0-0", None]
+
+    def test_small_file_is_not_probed(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, requested_ranges, _ = range_server
+        output = tmp_path / "file.bin"
+
+        download_file(url, output, len(content), segments=3)
+
+        assert output.read_bytes() == content
+        assert requested_ranges == [None]
+
+    def test_corrupt_segmented_download_is_detected(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, _, _ = range_server
+
+        with (
+            patch("piccione.download.from_figshare.SEGMENT_THRESHOLD", 1000),
+            pytest.raises(ValueError, match="MD5 mismatch"),
+        ):
+            download_file(url, tmp_path / "file.bin", len(content), "0" * 32, segments=2)
+
+
+class TestResumableDownload:
+    def test_partial_stream_is_resumed(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, requested_ranges, _ = range_server
+        output = tmp_path / "file.bin"
+        part_path(output).write_bytes(content[:40000])
+        md5 = hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+        download_file(url, output, len(content), md5)
+
+        assert output.read_bytes() == content
+        assert not part_path(output).exists()
+        assert requested_ranges == ["bytes=40000-"]
+
+    def test_partial_is_restarted_when_range_is_ignored(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, _, honour_ranges = range_server
+        honour_ranges[0] = False
+        output = tmp_path / "file.bin"
+        part_path(output).write_bytes(content[:40000])
+
+        download_file(url, output, len(content), hashlib.md5(content, usedforsecurity=False).hexdigest())
+
+        assert output.read_bytes() == content
+
+    def test_segmented_download_resumes_missing_ranges(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, requested_ranges, _ = range_server
+        output = tmp_path / "file.bin"
+        part = part_path(output)
+        part.write_bytes(content[:50000] + bytes(50000))
+        ranges_path(part).write_text("[0]")
+
+        with patch("piccione.download.from_figshare.SEGMENT_THRESHOLD", 1000):
+            download_file(
+                url,
+                output,
+                len(content),
+                hashlib.md5(content, usedforsecurity=False).hexdigest(),
+                segments=2,
+            )
+
+        assert output.read_bytes() == content
+        assert requested_ranges == ["bytes=0-0", "bytes=50000-99999"]
+        assert not ranges_path(part).exists()
+
+    def test_corrupt_part_is_discarded(
+        self,
+        tmp_path: Path,
+        range_server: tuple[str, bytes, list[str | None], list[bool]],
+    ) -> None:
+        url, content, _, _ = range_server
+        output = tmp_path / "file.bin"
+        part_path(output).write_bytes(b"garbage")
+
+        with pytest.raises(ValueError, match="MD5 mismatch"):
+            download_file(url, output, len(content), hashlib.md5(content, usedforsecurity=False).hexdigest())
+
+        assert not part_path(output).exists()
+        assert not output.exists()
+
+
+class TestSkipCompleteFiles:
+    def test_complete_files_are_skipped_without_hashing(self, tmp_path: Path) -> None:
+        content = b"already here"
+        existing = tmp_path / "existing.txt"
+        existing.write_bytes(content)
+        cache = DigestCache(tmp_path / ".figshare-digests.json")
+        cache.record(existing, hashlib.md5(content, usedforsecurity=False).hexdigest())
+        cache.save()
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+            patch("piccione.digest_cache.compute_md5") as mock_compute,
+        ):
+            summary = download_files([file_entry("existing.txt", content)], tmp_path)
+
+        mock_create_session.return_value.__enter__.return_value.get.assert_not_called()
+        mock_compute.assert_not_called()
+        assert summary.skipped == 1
+        assert summary.downloaded == 0
+
+    def test_files_with_a_different_size_or_digest_are_downloaded_again(self, tmp_path: Path) -> None:
+        (tmp_path / "short.txt").write_bytes(b"old")
+        (tmp_path / "changed.txt").write_bytes(b"old content")
+        files = [file_entry("short.txt", b"new content"), file_entry("changed.txt", b"new content")]
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = lambda *_args, **_kwargs: MagicMock(raw=io.BytesIO(b"new content"))
+            summary = download_files(files, tmp_path)
+
+        assert summary.downloaded == 2
+        assert (tmp_path / "short.txt").read_bytes() == b"new content"
+        assert (tmp_path / "changed.txt").read_bytes() == b"new content"
+
+        # The digests of the new files are recorded, so the next run skips them without hashing.
+        with (
+            patch("piccione.download.from_figshare.create_session"),
+            patch("piccione.download.from_figshare.tqdm"),
+            patch("piccione.digest_cache.compute_md5") as mock_compute,
+        ):
+            assert download_files(files, tmp_path).skipped == 2
+        mock_compute.assert_not_called()
+
+
+class TestPipeResponse:
+    def test_blocks_reach_the_sink_in_order_through_reused_buffers(self) -> None:
+        content = os.urandom(10000)
+        received = bytearray()
+        buffers: set[int] = set()
+
+        def sink(block: memoryview) -> None:
+            buffers.add(id(block.obj))
+            received.extend(block)
+
+        pipe_response(MagicMock(raw=io.BytesIO(content)), sink, buffer_size=1000, buffers=2)
+
+        assert bytes(received) == content
+        assert len(buffers) <= 2
+
+    def test_sink_errors_stop_the_reader_and_propagate(self) -> None:
+        response = MagicMock(raw=io.BytesIO(os.urandom(10000)))
+
+        def sink(_block: memoryview) -> None:
+            msg = "disk full"
+            raise OSError(msg)
+
+        with pytest.raises(OSError, match="disk full"):
+            pipe_response(response, sink, buffer_size=1000, buffers=2)
+        assert response.raw.tell() < 10000
+
+
+class TestThrottledProgress:
+    def test_updates_are_batched_until_flushed(self) -> None:
+        bar = MagicMock()
+        progress = ThrottledProgress(bar, interval=3600)
+
+        for _ in range(100):
+            progress.update(10)
+        bar.update.assert_not_called()
+
+        progress.flush()
+        bar.update.assert_called_once_with(1000)
+
+
+class TestExtractOnDownload:
+    def test_archives_are_unpacked_instead_of_stored_and_skipped_afterwards(self, tmp_path: Path) -> None:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            info = tarfile.TarInfo("table.csv")
+            info.size = 5
+            archive.addfile(info, io.BytesIO(b"a,b,c"))
+        compressed = buffer.getvalue()
+        files = [file_entry("dump.tar.gz", compressed)]
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = lambda *_args, **_kwargs: MagicMock(raw=io.BytesIO(compressed))
+            summary = download_files(files, tmp_path, extract=True)
+            assert download_files(files, tmp_path, extract=True).skipped == 1
+
+        assert summary.downloaded == 1
+        assert (tmp_path / "dump" / "table.csv").read_bytes() == b"a,b,c"
+        assert not (tmp_path / "dump.tar.gz").exists()
+        assert not (tmp_path / "dump.part").exists()
+
+    def test_archives_failing_the_md5_check_leave_nothing_behind(self, tmp_path: Path) -> None:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as archive:
+            archive.addfile(tarfile.TarInfo("empty.txt"))
+        files = [file_entry("dump.tar", buffer.getvalue(), md5="0" * 32)]
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = lambda *_args, **_kwargs: MagicMock(raw=io.BytesIO(buffer.getvalue()))
+            summary = download_files(files, tmp_path, extract=True)
+
+        assert summary.failed == ["dump.tar"]
+        assert not (tmp_path / "dump").exists()
+        assert not (tmp_path / "dump.part").exists()
+
+
+class TestSyncFiles:
+    def test_only_new_or_changed_files_are_fetched(self, tmp_path: Path) -> None:
+        contents = {"kept.txt": b"kept", "changed.txt": b"version 1"}
+        files = [file_entry(name, content) for name, content in contents.items()]
+
+        def get(url: str, **_kwargs: object) -> MagicMock:
+            return MagicMock(raw=io.BytesIO(contents[url.rsplit("/", 1)[-1]]))
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = get
+            assert sync_files(files, tmp_path).downloaded == 2
+
+            contents["changed.txt"] = b"version 2"
+            files = [file_entry("kept.txt", b"kept"), file_entry("changed.txt", b"version 2", file_id=2)]
+            session.get.reset_mock()
+            with patch("piccione.download.from_figshare.is_complete") as mock_is_complete:
+                mock_is_complete.return_value = False
+                summary = sync_files(files, tmp_path)
+
+        assert summary.downloaded == 1
+        assert summary.skipped == 1
+        # The unchanged file is not even checked against the digest cache.
+        assert [call.args[0] for call in mock_is_complete.call_args_list] == [tmp_path / "changed.txt"]
+        assert (tmp_path / "changed.txt").read_bytes() == b"version 2"
+        assert json.loads((tmp_path / ".figshare-manifest.json").read_text())["changed.txt"] == {
+            "id": 2,
+            "size": 9,
+            "md5": hashlib.md5(b"version 2", usedforsecurity=False).hexdigest(),
+        }
+
+    def test_changed_archive_replaces_its_extraction(self, tmp_path: Path) -> None:
+        def tar_gz(member: bytes) -> bytes:
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+                info = tarfile.TarInfo("table.csv")
+                info.size = len(member)
+                archive.addfile(info, io.BytesIO(member))
+            return buffer.getvalue()
+
+        archives = {1: tar_gz(b"a,b"), 2: tar_gz(b"a,b,c,d")}
+
+        with (
+            patch("piccione.download.from_figshare.create_session") as mock_create_session,
+            patch("piccione.download.from_figshare.tqdm"),
+        ):
+            session = mock_create_session.return_value.__enter__.return_value
+            session.get.side_effect = lambda *_args, **_kwargs: MagicMock(raw=io.BytesIO(archives[1]))
+            sync_files([file_entry("dump.tar.gz", archives[1])], tmp_path, extract=True)
+            session.get.side_effect = lambda *_args, **_kwargs: MagicMock(raw=io.BytesIO(archives[2]))
+            summary = sync_files([file_entry("dump.tar.gz", archives[2], file_id=2)], tmp_path, extract=True)
+
+        assert summary.downloaded == 1
+        assert (tmp_path / "dump" / "table.csv").read_bytes() == b"a,b,c,d"
+        assert json.loads((tmp_path / ".figshare-manifest.json").read_text())["dump.tar.gz"]["id"] == 2
+
+    def test_files_dropped_since_the_last_sync_are_removed_only_with_delete(self, tmp_path: Path) -> None:
+        (tmp_path / "old.txt").write_bytes(b"old")
+        (tmp_path / "new.txt").write_bytes(b"new")
+        (tmp_path / "dump").mkdir()
+        (tmp_path / "dump" / "member.txt").write_bytes(b"member")
+        (tmp_path / "big.bin.part").write_bytes(b"partial")
+        (tmp_path / "unrelated.txt").write_bytes(b"not from Figshare")
+        new_files = [file_entry("new.txt", b"new"), file_entry("big.bin", b"not yet")]
+        old_files = [file_entry("old.txt", b"old"), file_entry("dump.tar", b"archive"), *new_files]
+
+        with (
+            patch("piccione.download.from_figshare.create_session"),
+            patch("piccione.download.from_figshare.tqdm"),
+            patch("piccione.download.from_figshare.fetch_file", return_value=False),
+        ):
+            sync_files(old_files, tmp_path, extract=True, delete=True)
+            assert sync_files(new_files, tmp_path, extract=True).removed == 0
+            assert (tmp_path / "old.txt").exists()
+            summary = sync_files(new_files, tmp_path, extract=True, delete=True)
+
+        assert summary.removed == 2
+        assert not (tmp_path / "old.txt").exists()
+        assert not (tmp_path / "dump").exists()
+        assert (tmp_path / "new.txt").exists()
+        assert (tmp_path / "big.bin.part").exists()
+        # Files that no sync recorded are never removed.
+        assert (tmp_path / "unrelated.txt").exists()
+        assert set(json.loads((tmp_path / ".figshare-manifest.json").read_text())) == {"new.txt", "big.bin"}
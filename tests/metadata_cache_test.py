@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from piccione.download.metadata_cache import MetadataCache
+
+URL = "https://api.figshare.com/v2/articles/123/files"
+
+
+def response(status_code: int = 200, data: object = None, headers: dict[str, str] | None = None) -> MagicMock:
+    mock = MagicMock(status_code=status_code, headers=headers or {})
+    mock.json.return_value = data
+    return mock
+
+
+class TestMetadataCache:
+    def test_unchanged_resources_are_revalidated_without_parsing(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path / "metadata.json")
+        first = response(data=[{"name": "a.txt"}], headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2026"})
+        not_modified = response(status_code=304)
+
+        with patch("piccione.download.metadata_cache.requests.get", side_effect=[first, not_modified]) as mock_get:
+            assert cache.get_json(URL, {"page": 1}) == [{"name": "a.txt"}]
+            cache.save()
+            assert MetadataCache(tmp_path / "metadata.json").get_json(URL, {"page": 1}) == [{"name": "a.txt"}]
+
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2026",
+        }
+        not_modified.json.assert_not_called()
+
+    def test_changed_resources_replace_the_record(self, tmp_path: Path) -> None:
+        cache = MetadataCache(tmp_path / "metadata.json")
+        responses = [response(data=["old"], headers={"ETag": '"v1"'}), response(data=["new"], headers={"ETag": '"v2"'})]
+
+        with patch("piccione.download.metadata_cache.requests.get", side_effect=responses):
+            assert cache.get_json(URL) == ["old"]
+            assert cache.get_json(URL) == ["new"]
+
+    def test_fresh_records_are_reused_without_a_request(self) -> None:
+        cache = MetadataCache(ttl=3600)
+
+        with patch("piccione.download.metadata_cache.requests.get", return_value=response(data=["cached"])) as mock_get:
+            assert cache.get_json(URL) == ["cached"]
+            assert cache.get_json(URL) == ["cached"]
+
+        assert mock_get.call_count == 1
+
+    def test_query_parameters_are_part_of_the_key(self) -> None:
+        cache = MetadataCache(ttl=3600)
+        responses = [response(data=["page 1"]), response(data=["page 2"])]
+
+        with patch("piccione.download.metadata_cache.requests.get", side_effect=responses):
+            assert cache.get_json(URL, {"page": 1}) == ["page 1"]
+            assert cache.get_json(URL, {"page": 2}) == ["page 2"]
+            assert cache.get_json(URL, {"page": 1}) == ["page 1"]
@@ -3,26 +3,44 @@
 # SPDX-License-Identifier: ISC
 
 import hashlib
-from io import BytesIO
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
+from piccione.digest_cache import compute_md5
 from piccione.upload.on_figshare import (
     FigshareFileInfo,
     FigsharePart,
+    PartReader,
+    Throttle,
+    TransferLimits,
+    VerifyOptions,
     complete_upload,
     create_file,
+    get_existing_files,
     get_file_check_data,
+    get_session,
     issue_request,
     main,
     upload_part,
     upload_parts,
+    verify_upload,
 )
 
 
+def read_body(data: object) -> bytes:
+    assert isinstance(data, PartReader)
+    return b"".join(bytes(block) for block in data)
+
+
 class TestGetFileCheckData:
     def test_returns_md5_and_size(self, tmp_path: Path) -> None:
         test_file = tmp_path / "test.txt"
@@ -45,6 +63,20 @@ class TestGetFileCheckData:
         assert size == 2097152
 
 
+class TestGetSession:
+    def test_session_is_shared_and_authorized(self) -> None:
+        with patch.dict("piccione.upload.on_figshare._sessions", clear=True):
+            session = get_session("session_token", pool_size=8)
+
+            assert get_session("session_token") is session
+            assert get_session("other_token") is not session
+
+        assert session.headers["Authorization"] == "token session_token"
+        adapter = session.get_adapter("https://api.figshare.com")
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_maxsize == 8  # noqa: SLF001
+
+
 class TestIssueRequest:
     def test_successful_json_response(self) -> None:
         mock_response = MagicMock()
@@ -52,14 +84,16 @@ class TestIssueRequest:
         mock_response.content = b'{"key": "value"}'
         mock_response.raise_for_status = MagicMock()
 
-        with patch("piccione.upload.on_figshare.requests.request", return_value=mock_response) as mock_req:
+        with patch("piccione.upload.on_figshare.get_session") as mock_get_session:
+            mock_req = mock_get_session.return_value.request
+            mock_req.return_value = mock_response
             result = issue_request("GET", "https://api.figshare.com/test", "mytoken")
 
         assert result == {"key": "value"}
+        mock_get_session.assert_called_once_with("mytoken")
         mock_req.assert_called_once_with(
             "GET",
             "https://api.figshare.com/test",
-            headers={"Authorization": "token mytoken"},
             data=None,
             timeout=(30, 300),
         )
@@ -70,7 +104,8 @@ class TestIssueRequest:
         mock_response.content = b"binary data"
         mock_response.raise_for_status = MagicMock()
 
-        with patch("piccione.upload.on_figshare.requests.request", return_value=mock_response):
+        with patch("piccione.upload.on_figshare.get_session") as mock_get_session:
+            mock_get_session.return_value.request.return_value = mock_response
             result = issue_request("GET", "https://api.figshare.com/test", "token")
 
         assert result == b"binary data"
@@ -81,7 +116,9 @@ class TestIssueRequest:
         mock_response.content = b'{"result": "ok"}'
         mock_response.raise_for_status = MagicMock()
 
-        with patch("piccione.upload.on_figshare.requests.request", return_value=mock_response) as mock_req:
+        with patch("piccione.upload.on_figshare.get_session") as mock_get_session:
+            mock_req = mock_get_session.return_value.request
+            mock_req.return_value = mock_response
             issue_request("POST", "https://api.figshare.com/test", "token", data={"foo": "bar"})
 
         call_kwargs = mock_req.call_args[1]
@@ -93,7 +130,9 @@ class TestIssueRequest:
         mock_response.content = b""
         mock_response.raise_for_status = MagicMock()
 
-        with patch("piccione.upload.on_figshare.requests.request", return_value=mock_response) as mock_req:
+        with patch("piccione.upload.on_figshare.get_session") as mock_get_session:
+            mock_req = mock_get_session.return_value.request
+            mock_req.return_value = mock_response
             issue_request("PUT", "https://api.figshare.com/test", "token", data=b"raw bytes", binary=True)
 
         call_kwargs = mock_req.call_args[1]
@@ -106,28 +145,100 @@ class TestIssueRequest:
         mock_response.text = "Resource not found"
 
         with (
-            patch("piccione.upload.on_figshare.requests.request", return_value=mock_response),
+            patch(
+                "piccione.upload.on_figshare.get_session",
+                return_value=MagicMock(request=lambda *_a, **_kw: mock_response),
+            ),
             pytest.raises(requests.exceptions.HTTPError),
         ):
             issue_request("GET", "https://api.figshare.com/test", "token")
 
 
 class TestUploadPart:
-    def test_uploads_correct_chunk(self) -> None:
+    def test_uploads_correct_chunk(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"0123456789")
         file_info: FigshareFileInfo = {"upload_url": "https://upload.figshare.com/parts", "id": 0}
-        stream = BytesIO(b"0123456789")
         part: FigsharePart = {"partNo": 1, "startOffset": 2, "endOffset": 5}
 
-        with patch("piccione.upload.on_figshare.issue_request") as mock_issue:
-            upload_part(file_info, stream, part, "token123")
+        sent: list[bytes] = []
+
+        fd = os.open(test_file, os.O_RDONLY)
+        try:
+            with patch(
+                "piccione.upload.on_figshare.issue_request",
+                side_effect=lambda **kwargs: sent.append(read_body(kwargs["data"])),
+            ) as mock_issue:
+                upload_part(file_info, fd, part, "token123")
+        finally:
+            os.close(fd)
 
         mock_issue.assert_called_once_with(
             method="PUT",
             url="https://upload.figshare.com/parts/1",
-            data=b"2345",
+            data=ANY,
             binary=True,
             token="token123",  # noqa: S106
         )
+        assert sent == [b"2345"]
+
+
+class TestPartReader:
+    def test_part_is_read_through_a_bounded_buffer(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.bin"
+        test_file.write_bytes(bytes(range(100)))
+
+        fd = os.open(test_file, os.O_RDONLY)
+        try:
+            reader = PartReader(fd, offset=10, size=50, buffer_size=16)
+            blocks = [bytes(block) for block in reader]
+            assert len(reader) == 50
+            assert reader.tell() == 50
+            assert max(len(block) for block in blocks) == 16
+            assert b"".join(blocks) == bytes(range(10, 60))
+
+            reader.seek(0)
+            assert bytes(reader.read(4)) == bytes(range(10, 14))
+            assert reader.tell() == 4
+        finally:
+            os.close(fd)
+
+    def test_part_is_streamed_to_the_server(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.bin"
+        content = os.urandom(300000)
+        test_file.write_bytes(content)
+        received: list[tuple[str | None, bytes]] = []
+        statuses = [500, 200]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_PUT(self) -> None:
+                length = self.headers["Content-Length"]
+                received.append((length, self.rfile.read(int(length or 0))))
+                self.send_response(statuses.pop(0))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        fd = os.open(test_file, os.O_RDONLY)
+        try:
+            with (
+                patch.dict("piccione.upload.on_figshare._sessions", clear=True),
+                patch("piccione.upload.on_figshare.time.sleep"),
+            ):
+                reader = PartReader(fd, offset=1000, size=200000)
+                issue_request("PUT", f"http://127.0.0.1:{server.server_port}/1", "token", data=reader, binary=True)
+        finally:
+            os.close(fd)
+            server.shutdown()
+            server.server_close()
+
+        # The second attempt after the server error sends the part again from its start.
+        assert received == [("200000", content[1000:201000])] * 2
 
 
 class TestUploadParts:
@@ -136,15 +247,22 @@ class TestUploadParts:
         test_file.write_bytes(b"0123456789")
 
         file_info: FigshareFileInfo = {"upload_url": "https://upload.figshare.com/parts", "id": 0}
-        parts_response = {
+        parts_response: dict[str, object] = {
             "parts": [
                 {"partNo": 1, "startOffset": 0, "endOffset": 4},
                 {"partNo": 2, "startOffset": 5, "endOffset": 9},
             ],
         }
 
+        puts: list[tuple[str, bytes]] = []
+
+        def issue(method: str, url: str, **kwargs: object) -> dict[str, object]:
+            if method == "PUT":
+                puts.append((url, read_body(kwargs["data"])))
+            return parts_response
+
         with (
-            patch("piccione.upload.on_figshare.issue_request", return_value=parts_response) as mock_issue,
+            patch("piccione.upload.on_figshare.issue_request", side_effect=issue) as mock_issue,
             patch("piccione.upload.on_figshare.tqdm"),
         ):
             upload_parts(file_info, str(test_file), "token")
@@ -152,10 +270,202 @@ class TestUploadParts:
         assert mock_issue.call_count == 3  # 1 GET + 2 PUTs
         calls = mock_issue.call_args_list
         assert calls[0][1]["method"] == "GET"
-        assert calls[1][1]["method"] == "PUT"
-        assert calls[1][1]["data"] == b"01234"
-        assert calls[2][1]["method"] == "PUT"
-        assert calls[2][1]["data"] == b"56789"
+        assert sorted(puts) == [
+            ("https://upload.figshare.com/parts/1", b"01234"),
+            ("https://upload.figshare.com/parts/2", b"56789"),
+        ]
+
+    def test_parts_are_uploaded_concurrently(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"0123456789ab")
+
+        file_info: FigshareFileInfo = {"upload_url": "https://upload.figshare.com/parts", "id": 0}
+        parts_response: dict[str, object] = {
+            "parts": [{"partNo": i + 1, "startOffset": i * 4, "endOffset": i * 4 + 3} for i in range(3)],
+        }
+        # Every PUT waits for the others: this only completes if all three parts are in flight at once.
+        barrier = threading.Barrier(3, timeout=5)
+        sent: list[bytes] = []
+
+        def issue(method: str, **kwargs: object) -> dict[str, object]:
+            if method == "PUT":
+                barrier.wait()
+                sent.append(read_body(kwargs["data"]))
+                return {}
+            return parts_response
+
+        with (
+            patch("piccione.upload.on_figshare.issue_request", side_effect=issue),
+            patch("piccione.upload.on_figshare.tqdm") as mock_tqdm,
+        ):
+            upload_parts(file_info, str(test_file), "token", workers=3)
+
+        assert sorted(sent) == [b"0123", b"4567", b"89ab"]
+        pbar = mock_tqdm.return_value.__enter__.return_value
+        assert sum(call[0][0] for call in pbar.update.call_args_list) == 12
+
+    def test_connection_limit_is_respected(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"0123456789ab")
+
+        file_info: FigshareFileInfo = {"upload_url": "https://upload.figshare.com/parts", "id": 0}
+        parts_response: dict[str, object] = {
+            "parts": [{"partNo": i + 1, "startOffset": i * 4, "endOffset": i * 4 + 3} for i in range(3)],
+        }
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def issue(method: str, **_kwargs: object) -> dict[str, object]:
+            nonlocal in_flight, peak
+            if method == "PUT":
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                time.sleep(0.02)
+                with lock:
+                    in_flight -= 1
+            return parts_response
+
+        limits = TransferLimits(connections=threading.BoundedSemaphore(1))
+        with (
+            patch("piccione.upload.on_figshare.issue_request", side_effect=issue),
+            patch("piccione.upload.on_figshare.tqdm"),
+        ):
+            upload_parts(file_info, str(test_file), "token", workers=3, limits=limits)
+
+        assert peak == 1
+
+    def test_completed_parts_are_skipped(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"0123456789")
+
+        file_info: FigshareFileInfo = {"upload_url": "https://upload.figshare.com/parts", "id": 0}
+        parts_response = {
+            "parts": [
+                {"partNo": 1, "startOffset": 0, "endOffset": 4, "status": "COMPLETE"},
+                {"partNo": 2, "startOffset": 5, "endOffset": 9, "status": "PENDING"},
+            ],
+        }
+
+        with (
+            patch("piccione.upload.on_figshare.issue_request", return_value=parts_response) as mock_issue,
+            patch("piccione.upload.on_figshare.tqdm") as mock_tqdm,
+        ):
+            upload_parts(file_info, str(test_file), "token")
+
+        assert mock_issue.call_count == 2
+        assert mock_issue.call_args[1]["url"] == "https://upload.figshare.com/parts/2"
+        assert mock_tqdm.call_args[1]["initial"] == 5
+
+    def test_failed_part_is_raised(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"0123456789")
+
+        file_info: FigshareFileInfo = {"upload_url": "https://upload.figshare.com/parts", "id": 0}
+        parts_response = {"parts": [{"partNo": 1, "startOffset": 0, "endOffset": 9}]}
+        error = requests.exceptions.HTTPError("403 Forbidden")
+
+        with (
+            patch("piccione.upload.on_figshare.issue_request", side_effect=[parts_response, error]),
+            patch("piccione.upload.on_figshare.tqdm"),
+            pytest.raises(requests.exceptions.HTTPError),
+        ):
+            upload_parts(file_info, str(test_file), "token")
+
+
+class TestThrottle:
+    def test_transfers_are_paced_to_the_rate(self) -> None:
+        clock = [100.0]
+
+        with (
+            patch("piccione.upload.on_figshare.time.monotonic", side_effect=lambda: clock[0]),
+            patch("piccione.upload.on_figshare.time.sleep") as mock_sleep,
+        ):
+            throttle = Throttle(rate=1000)
+            throttle.consume(500)
+            throttle.consume(500)
+            clock[0] = 102.0
+            throttle.consume(500)
+
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [0.5]
+
+
+class TestGetExistingFiles:
+    @staticmethod
+    def _paged_session(files: list[dict[str, object]], page_size: int) -> MagicMock:
+        def get(url: str, params: dict[str, int], **_kwargs: object) -> MagicMock:
+            start = (params["page"] - 1) * params["page_size"]
+            response = MagicMock()
+            response.json.return_value = files[start : start + page_size]
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = get
+        return session
+
+    def test_all_pages_are_fetched(self) -> None:
+        files = [{"id": i, "name": f"file{i}.txt", "computed_md5": f"md5-{i}", "size": i} for i in range(5)]
+        session = self._paged_session(files, page_size=2)
+
+        with (
+            patch("piccione.upload.on_figshare.FILES_PAGE_SIZE", 2),
+            patch("piccione.upload.on_figshare.get_session", return_value=session),
+        ):
+            existing = get_existing_files("12345", "token", workers=2)
+
+        assert existing == {f"file{i}.txt": {"id": i, "md5": f"md5-{i}", "size": i} for i in range(5)}
+        pages = sorted(call[1]["params"]["page"] for call in session.get.call_args_list)
+        assert pages == [1, 2, 3]
+        assert session.get.call_args_list[0][0][0] == "https://api.figshare.com/v2/account/articles/12345/files"
+
+    def test_short_first_page_needs_no_further_requests(self) -> None:
+        session = self._paged_session([{"id": 1, "name": "a.txt", "computed_md5": "md5", "size": 3}], page_size=2)
+
+        with (
+            patch("piccione.upload.on_figshare.FILES_PAGE_SIZE", 2),
+            patch("piccione.upload.on_figshare.get_session", return_value=session),
+        ):
+            existing = get_existing_files("12345", "token")
+
+        assert existing == {"a.txt": {"id": 1, "md5": "md5", "size": 3}}
+        session.get.assert_called_once()
+
+
+class TestVerifyUpload:
+    def test_polls_until_figshare_computes_the_digest(self) -> None:
+        options = VerifyOptions(report=Path("report.json"), poll_interval=0)
+        statuses = [{"status": "created", "computed_md5": ""}, {"status": "available", "computed_md5": "abc"}]
+
+        with patch("piccione.upload.on_figshare.get_file_status", side_effect=statuses) as mock_status:
+            result = verify_upload("12345", "/data/a.txt", 7, "abc", "token", options)
+
+        assert result == {
+            "file": "/data/a.txt",
+            "file_id": 7,
+            "local_md5": "abc",
+            "remote_md5": "abc",
+            "status": "ok",
+        }
+        assert mock_status.call_count == 2
+        mock_status.assert_called_with("12345", "7", "token")
+
+    def test_mismatch_is_reported(self) -> None:
+        options = VerifyOptions(report=Path("report.json"))
+
+        with patch("piccione.upload.on_figshare.get_file_status", return_value={"computed_md5": "def"}):
+            result = verify_upload("12345", "/data/a.txt", 7, "abc", "token", options)
+
+        assert result["status"] == "mismatch"
+        assert result["remote_md5"] == "def"
+
+    def test_digest_missing_after_timeout_is_unverified(self) -> None:
+        options = VerifyOptions(report=Path("report.json"), timeout=0)
+
+        with patch("piccione.upload.on_figshare.get_file_status", return_value={"computed_md5": ""}):
+            result = verify_upload("12345", "/data/a.txt", 7, "abc", "token", options)
+
+        assert result["status"] == "unverified"
 
 
 class TestCreateFile:
@@ -169,27 +479,25 @@ class TestCreateFile:
         mock_get_response = MagicMock()
         mock_get_response.json.return_value = {"id": 123, "name": "data.txt"}
 
-        with (
-            patch("piccione.upload.on_figshare.requests.post", return_value=mock_post_response) as mock_post,
-            patch("piccione.upload.on_figshare.requests.get", return_value=mock_get_response) as mock_get,
-        ):
+        with patch("piccione.upload.on_figshare.get_session") as mock_get_session:
+            session = mock_get_session.return_value
+            session.post.return_value = mock_post_response
+            session.get.return_value = mock_get_response
             result = create_file("article_1", "data.txt", str(test_file), "token")
 
         assert result == {"id": 123, "name": "data.txt"}
 
+        mock_get_session.assert_called_once_with("token")
+        mock_post = session.post
+        mock_get = session.get
         mock_post.assert_called_once()
         post_call = mock_post.call_args
         assert post_call[0][0] == "https://api.figshare.com/v2/account/articles/article_1/files"
-        assert post_call[1]["headers"] == {"Authorization": "token token"}
         assert post_call[1]["json"]["name"] == "data.txt"
         assert post_call[1]["json"]["size"] == 7
         assert post_call[1]["json"]["md5"] == hashlib.md5(b"content", usedforsecurity=False).hexdigest()
 
-        mock_get.assert_called_once_with(
-            "https://api.figshare.com/files/123",
-            headers={"Authorization": "token token"},
-            timeout=30,
-        )
+        mock_get.assert_called_once_with("https://api.figshare.com/files/123", timeout=30)
 
 
 class TestCompleteUpload:
@@ -239,3 +547,321 @@ files_to_upload:
         assert mock_complete.call_count == 2
         mock_complete.assert_any_call("12345", "f1", "test_token")
         mock_complete.assert_any_call("12345", "f2", "test_token")
+
+    def _write_resume_config(self, tmp_path: Path, data_file: Path) -> tuple[Path, Path]:
+        state_file = tmp_path / "upload_state.json"
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"""
+TOKEN: test_token
+ARTICLE_ID: "12345"
+UPLOAD_STATE: {state_file}
+files_to_upload:
+  - {data_file}
+""")
+        return config_file, state_file
+
+    def test_interrupted_upload_is_resumed(self, tmp_path: Path) -> None:
+        data_file = tmp_path / "big.bin"
+        data_file.write_bytes(b"content")
+        config_file, state_file = self._write_resume_config(tmp_path, data_file)
+        partial = {"big.bin": {"id": "f1", "md5": ""}}
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value=partial),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                return_value={"id": "f1", "upload_url": "https://upload/1"},
+            ),
+            patch("piccione.upload.on_figshare.upload_parts", side_effect=requests.exceptions.ConnectionError),
+            patch("piccione.upload.on_figshare.delete_file"),
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+            pytest.raises(requests.exceptions.ConnectionError),
+        ):
+            main(str(config_file))
+
+        assert json.loads(state_file.read_text()) == {
+            str(data_file): {
+                "id": "f1",
+                "upload_url": "https://upload/1",
+                "md5": hashlib.md5(b"content", usedforsecurity=False).hexdigest(),
+                "size": 7,
+            },
+        }
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value=partial),
+            patch("piccione.upload.on_figshare.create_file") as mock_create,
+            patch("piccione.upload.on_figshare.delete_file") as mock_delete,
+            patch("piccione.upload.on_figshare.upload_parts") as mock_upload,
+            patch("piccione.upload.on_figshare.complete_upload") as mock_complete,
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+        ):
+            main(str(config_file))
+
+        mock_create.assert_not_called()
+        mock_delete.assert_not_called()
+        mock_upload.assert_called_once_with(
+            {"id": "f1", "upload_url": "https://upload/1"},
+            str(data_file),
+            "test_token",
+            4,
+            ANY,
+        )
+        mock_complete.assert_called_once_with("12345", "f1", "test_token")
+        assert json.loads(state_file.read_text()) == {}
+
+    def test_expired_upload_starts_over(self, tmp_path: Path) -> None:
+        data_file = tmp_path / "big.bin"
+        data_file.write_bytes(b"content")
+        config_file, state_file = self._write_resume_config(tmp_path, data_file)
+        md5 = hashlib.md5(b"content", usedforsecurity=False).hexdigest()
+        state_file.write_text(
+            json.dumps({str(data_file): {"id": "old", "upload_url": "https://upload/old", "md5": md5, "size": 7}}),
+        )
+        expired = requests.exceptions.HTTPError("404 Not Found")
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value={"big.bin": {"id": "old", "md5": ""}}),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                return_value={"id": "new", "upload_url": "https://upload/new"},
+            ) as mock_create,
+            patch("piccione.upload.on_figshare.delete_file") as mock_delete,
+            patch("piccione.upload.on_figshare.upload_parts", side_effect=[expired, None]),
+            patch("piccione.upload.on_figshare.complete_upload") as mock_complete,
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+        ):
+            main(str(config_file))
+
+        mock_delete.assert_called_once_with("12345", "old", "test_token")
+        mock_create.assert_called_once()
+        mock_complete.assert_called_once_with("12345", "new", "test_token")
+        assert json.loads(state_file.read_text()) == {}
+
+    def test_next_file_is_registered_while_parts_upload(self, tmp_path: Path) -> None:
+        files = [tmp_path / f"file{i}.txt" for i in range(3)]
+        for i, file in enumerate(files):
+            file.write_bytes(f"content{i}".encode())
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            'TOKEN: test_token\nARTICLE_ID: "12345"\nfiles_to_upload:\n' + "".join(f"  - {f}\n" for f in files),
+        )
+        second_registered = threading.Event()
+
+        def create(_article_id: str, file_name: str, *_args: object) -> dict[str, str]:
+            if file_name == "file1.txt":
+                second_registered.set()
+            return {"id": file_name, "upload_url": f"https://upload/{file_name}"}
+
+        def upload(file_info: FigshareFileInfo, *_args: object) -> None:
+            if file_info["id"] == "file0.txt":
+                assert second_registered.wait(timeout=5)
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value={}),
+            patch("piccione.upload.on_figshare.create_file", side_effect=create),
+            patch("piccione.upload.on_figshare.upload_parts", side_effect=upload),
+            patch("piccione.upload.on_figshare.complete_upload") as mock_complete,
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+        ):
+            main(str(config_file))
+
+        assert [call[0][1] for call in mock_complete.call_args_list] == ["file0.txt", "file1.txt", "file2.txt"]
+
+    def test_registration_error_is_raised(self, tmp_path: Path) -> None:
+        data_file = tmp_path / "file.txt"
+        data_file.write_bytes(b"content")
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f'TOKEN: test_token\nARTICLE_ID: "12345"\nfiles_to_upload:\n  - {data_file}\n')
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value={}),
+            patch("piccione.upload.on_figshare.create_file", side_effect=requests.exceptions.HTTPError("403")),
+            patch("piccione.upload.on_figshare.upload_parts") as mock_upload,
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+            pytest.raises(requests.exceptions.HTTPError),
+        ):
+            main(str(config_file))
+
+        mock_upload.assert_not_called()
+
+    def test_articles_are_uploaded_concurrently_and_failures_isolated(self, tmp_path: Path) -> None:
+        shared_file = tmp_path / "shared.txt"
+        shared_file.write_bytes(b"shared")
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"""
+TOKEN: test_token
+MAX_CONNECTIONS: 4
+BANDWIDTH_LIMIT: 1048576
+articles:
+  - ARTICLE_ID: 1
+    files_to_upload:
+      - {shared_file}
+  - ARTICLE_ID: 2
+    files_to_upload:
+      - {shared_file}
+  - ARTICLE_ID: 3
+    files_to_upload:
+      - {shared_file}
+""")
+
+        def existing(article_id: str, _token: str) -> dict[str, object]:
+            if article_id == "3":
+                msg = "article 3 is locked"
+                raise requests.exceptions.HTTPError(msg)
+            return {}
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", side_effect=existing),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                side_effect=lambda article_id, *_args: {"id": f"f{article_id}", "upload_url": "https://upload"},
+            ),
+            patch("piccione.upload.on_figshare.upload_parts") as mock_upload,
+            patch("piccione.upload.on_figshare.complete_upload") as mock_complete,
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+            patch("piccione.digest_cache.compute_md5", wraps=compute_md5) as mock_compute,
+            patch("piccione.upload.on_figshare.console") as mock_console,
+            pytest.raises(RuntimeError, match="articles: 3"),
+        ):
+            main(str(config_file))
+
+        assert sorted(call[0][0] for call in mock_complete.call_args_list) == ["1", "2"]
+        limits = mock_upload.call_args[0][4]
+        assert limits.connections is not None
+        assert limits.throttle.rate == 1048576
+        # Both articles share the digest cache, so the file is hashed once.
+        assert mock_compute.call_count == 1
+        printed = [str(call[0][0]) for call in mock_console.print.call_args_list if call[0]]
+        assert any(line.startswith("  1: 1 uploaded, 0 skipped") for line in printed)
+        assert any(line.startswith("  3: FAILED") for line in printed)
+
+    def test_uploads_are_verified_in_background(self, tmp_path: Path) -> None:
+        good_file = tmp_path / "good.txt"
+        bad_file = tmp_path / "bad.txt"
+        good_file.write_bytes(b"good")
+        bad_file.write_bytes(b"bad")
+        report = tmp_path / "verification.json"
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"""
+TOKEN: test_token
+ARTICLE_ID: "12345"
+VERIFY: true
+VERIFY_REPORT: {report}
+files_to_upload:
+  - {good_file}
+  - {bad_file}
+""")
+        remote_md5 = {"good": hashlib.md5(b"good", usedforsecurity=False).hexdigest(), "bad": "corrupted"}
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value={}),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                side_effect=lambda _article_id, name, *_args: {"id": Path(name).stem, "upload_url": "https://upload"},
+            ),
+            patch("piccione.upload.on_figshare.upload_parts"),
+            patch("piccione.upload.on_figshare.complete_upload"),
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+            patch(
+                "piccione.upload.on_figshare.get_file_status",
+                side_effect=lambda _article_id, file_id, _token: {"computed_md5": remote_md5[file_id]},
+            ),
+            pytest.raises(RuntimeError, match="12345"),
+        ):
+            main(str(config_file))
+
+        content = json.loads(report.read_text())
+        assert content["verified"] == 1
+        assert [entry["file"] for entry in content["mismatched"]] == [str(bad_file)]
+        assert content["unverified"] == []
+        assert report.with_suffix(".reupload.txt").read_text() == f"{bad_file}\n"
+
+    def test_failed_upload_cancels_pending_verifications(self, tmp_path: Path) -> None:
+        test_file = tmp_path / "test.txt"
+        test_file.write_bytes(b"content")
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            f'TOKEN: test_token\nARTICLE_ID: "12345"\nVERIFY: true\n'
+            f"VERIFY_REPORT: {tmp_path / 'verification.json'}\nfiles_to_upload:\n  - {test_file}\n",
+        )
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value={}),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                return_value={"id": 1, "upload_url": "https://upload"},
+            ),
+            patch("piccione.upload.on_figshare.upload_parts", side_effect=requests.exceptions.ConnectionError),
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+            patch("piccione.upload.on_figshare.UploadVerifier") as mock_verifier_cls,
+            pytest.raises(requests.exceptions.ConnectionError),
+        ):
+            main(str(config_file))
+
+        mock_verifier_cls.return_value.cancel.assert_called_once_with()
+        mock_verifier_cls.return_value.results.assert_not_called()
+
+    def test_small_files_are_bundled_before_upload(self, tmp_path: Path) -> None:
+        big_file = tmp_path / "big.bin"
+        big_file.write_bytes(b"x" * 100)
+        small_files = [tmp_path / f"small{i}.txt" for i in range(3)]
+        for file in small_files:
+            file.write_bytes(b"small")
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            f'TOKEN: test_token\nARTICLE_ID: "12345"\nBUNDLE:\n  directory: {tmp_path / "bundles"}\n'
+            "  threshold: 50\nfiles_to_upload:\n" + "".join(f"  - {f}\n" for f in [big_file, *small_files]),
+        )
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value={}),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                side_effect=lambda _article_id, name, *_args: {"id": name, "upload_url": "https://upload"},
+            ) as mock_create,
+            patch("piccione.upload.on_figshare.upload_parts"),
+            patch("piccione.upload.on_figshare.complete_upload"),
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+        ):
+            main(str(config_file))
+
+        assert [call[0][1] for call in mock_create.call_args_list] == ["big.bin", "bundle-0000.tar"]
+
+    def test_each_file_is_hashed_once(self, tmp_path: Path) -> None:
+        new_file = tmp_path / "new.txt"
+        unchanged_file = tmp_path / "unchanged.txt"
+        new_file.write_bytes(b"new")
+        unchanged_file.write_bytes(b"unchanged")
+        cache_file = tmp_path / "digests.json"
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(f"""
+TOKEN: test_token
+ARTICLE_ID: "12345"
+DIGEST_CACHE: {cache_file}
+files_to_upload:
+  - {new_file}
+  - {unchanged_file}
+""")
+        existing = {
+            "unchanged.txt": {"id": "f0", "md5": hashlib.md5(b"unchanged", usedforsecurity=False).hexdigest()},
+        }
+
+        with (
+            patch("piccione.upload.on_figshare.get_existing_files", return_value=existing),
+            patch(
+                "piccione.upload.on_figshare.create_file",
+                return_value={"id": "f1", "upload_url": "https://upload/1"},
+            ) as mock_create,
+            patch("piccione.upload.on_figshare.upload_parts"),
+            patch("piccione.upload.on_figshare.complete_upload"),
+            patch("piccione.upload.on_figshare.tqdm", side_effect=lambda x, **_kw: x),
+            patch("piccione.digest_cache.compute_md5", wraps=compute_md5) as mock_compute,
+        ):
+            main(str(config_file))
+            main(str(config_file))
+
+        assert mock_compute.call_count == 2
+        new_check_data = (hashlib.md5(b"new", usedforsecurity=False).hexdigest(), 3)
+        mock_create.assert_called_with("12345", "new.txt", str(new_file), "test_token", new_check_data)
@@ -2,20 +2,60 @@
 #
 # SPDX-License-Identifier: ISC
 
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 import redis
-from sparqlite import SPARQLClient
+from sparqlite import EndpointError, SPARQLClient
 
 from piccione.upload.cache_manager import CacheManager
-from piccione.upload.on_triplestore import remove_stop_file, save_failed_query_file, upload_sparql_updates
+from piccione.upload.on_triplestore import (
+    TimeoutPolicy,
+    build_update,
+    order_files,
+    remove_stop_file,
+    replica_failed_file,
+    run_update,
+    save_failed_query_file,
+    upload_sparql_updates,
+    watch_sparql_updates,
+)
+from piccione.upload.virtuoso import IsqlConnection
 from tests.conftest import REDIS_DB, REDIS_PORT
 
 SPARQL_ENDPOINT = "http://localhost:28890/sparql"
 
 
+@pytest.fixture
+def slow_endpoint() -> Iterator[str]:
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers["Content-Length"]))
+            release.wait(5)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/sparql"
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+
 class TestCacheManager:
     def test_cache_initialization(self, clean_redis: redis.Redis) -> None:
         initial_files = ["file1.sparql", "file2.sparql"]
@@ -289,3 +329,415 @@ class TestOnTriplestore:
         bindings = result["results"]["bindings"]
         assert len(bindings) == 1
         assert bindings[0]["o"]["value"] == "no cache value"
+
+    def test_invalid_syntax_is_rejected_without_contacting_endpoint(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        failed_file = Path(temp_dir) / "failed_queries.txt"
+        (sparql_dir / "broken.sparql").write_text("INSERT DATA { <http://s> <http://p> <http://o> .")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            upload_sparql_updates(SPARQL_ENDPOINT, sparql_dir, failed_file=failed_file, show_progress=False)
+
+        mock_client_cls.return_value.__enter__.return_value.update.assert_not_called()
+        assert failed_file.read_text() == "broken.sparql\n"
+
+    def test_validation_can_be_disabled(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        (sparql_dir / "vendor.sparql").write_text("VENDOR EXTENSION")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            upload_sparql_updates(SPARQL_ENDPOINT, sparql_dir, show_progress=False, validate=False)
+
+        mock_client_cls.return_value.__enter__.return_value.update.assert_called_once_with("VENDOR EXTENSION")
+
+
+class TestEndpointProfiles:
+    def test_build_update_joins_operations_and_prepends_pragmas(self) -> None:
+        queries = ["INSERT DATA { <http://a> <http://b> 1 } ;", "INSERT DATA { <http://a> <http://b> 2 } # end"]
+
+        assert build_update(queries, ("DEFINE sql:log-enable 3",)) == (
+            "DEFINE sql:log-enable 3\n"
+            "INSERT DATA { <http://a> <http://b> 1 } \n;\n"
+            "INSERT DATA { <http://a> <http://b> 2 } # end"
+        )
+
+    def test_virtuoso_profile_batches_files_with_pragmas(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        for i in range(3):
+            (sparql_dir / f"test{i}.sparql").write_text(f"INSERT DATA {{ <http://s> <http://p> {i} }}")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            upload_sparql_updates(SPARQL_ENDPOINT, sparql_dir, show_progress=False, profile="virtuoso", batch_size=2)
+
+        calls = mock_client_cls.return_value.__enter__.return_value.update.call_args_list
+        assert len(calls) == 2
+        assert calls[0][0][0].startswith("DEFINE sql:log-enable 3\nINSERT DATA")
+        assert calls[0][0][0].count("INSERT DATA") == 2
+        assert calls[1][0][0].count("INSERT DATA") == 1
+
+    def test_template_updates_are_never_batched(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        template = "DELETE { ?s <http://p> ?o } INSERT { ?s <http://p> 2 } WHERE { ?s <http://p> ?o }"
+        (sparql_dir / "template.sparql").write_text(template)
+        for i in range(2):
+            (sparql_dir / f"data{i}.sparql").write_text(f"INSERT DATA {{ <http://s> <http://p> {i} }}")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            upload_sparql_updates(SPARQL_ENDPOINT, sparql_dir, show_progress=False, profile="virtuoso", batch_size=3)
+
+        updates = [call[0][0] for call in mock_client_cls.return_value.__enter__.return_value.update.call_args_list]
+        assert f"DEFINE sql:log-enable 3\n{template}" in updates
+        assert sum(update.count("INSERT DATA") for update in updates) == 2
+
+    def test_failed_batch_is_retried_file_by_file(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        failed_file = Path(temp_dir) / "failed_queries.txt"
+        (sparql_dir / "good.sparql").write_text("INSERT DATA { <http://s> <http://p> 1 }")
+        (sparql_dir / "bad.sparql").write_text("INSERT DATA { <http://s> <http://p> <not an iri> }")
+
+        def update(query: str) -> None:
+            if "not an iri" in query:
+                msg = "Query syntax error"
+                raise ValueError(msg)
+
+        mock_cache = MagicMock()
+        mock_cache.__contains__ = MagicMock(return_value=False)
+        with (
+            patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls,
+            patch("piccione.upload.on_triplestore.CacheManager", return_value=mock_cache),
+        ):
+            mock_client_cls.return_value.__enter__.return_value.update.side_effect = update
+            upload_sparql_updates(
+                SPARQL_ENDPOINT,
+                sparql_dir,
+                failed_file=failed_file,
+                redis_host="localhost",
+                show_progress=False,
+                profile="virtuoso",
+            )
+
+        assert mock_client_cls.return_value.__enter__.return_value.update.call_count == 3
+        mock_cache.add.assert_called_once_with("good.sparql")
+        assert failed_file.read_text() == "bad.sparql\n"
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "DEFINE sql:log-enable 2\nINSERT DATA { <http://s> <http://p> 1 }",
+            "DEFINE sql:log-enable 2 INSERT DATA { <http://s> <http://p> 1 }",
+        ],
+    )
+    def test_files_with_own_pragmas_are_sent_alone_and_unchanged(self, temp_dir: str, query: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        (sparql_dir / "pragma.sparql").write_text(query)
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            upload_sparql_updates(SPARQL_ENDPOINT, sparql_dir, show_progress=False, profile="virtuoso")
+
+        mock_client_cls.return_value.__enter__.return_value.update.assert_called_once_with(query)
+
+    def test_data_files_are_bulk_loaded_when_isql_is_configured(self, temp_dir: str) -> None:
+        data_dir = Path(temp_dir) / "data"
+        data_dir.mkdir(parents=True)
+        failed_file = Path(temp_dir) / "failed_queries.txt"
+        (data_dir / "ok.nt.gz").write_bytes(b"")
+        (data_dir / "broken.ttl").write_text("")
+        isql = IsqlConnection(password="dba")  # noqa: S106
+
+        with (
+            patch("piccione.upload.on_triplestore.bulk_load", return_value={"broken.ttl"}) as mock_bulk_load,
+            patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls,
+        ):
+            upload_sparql_updates(
+                SPARQL_ENDPOINT,
+                data_dir,
+                failed_file=failed_file,
+                show_progress=False,
+                profile="virtuoso",
+                isql=isql,
+                data_graph="http://g",
+            )
+
+        args = mock_bulk_load.call_args[0]
+        assert args[0] is isql
+        assert sorted(args[2]) == ["broken.ttl", "ok.nt.gz"]
+        assert args[3] == "http://g"
+        mock_client_cls.assert_not_called()
+        assert failed_file.read_text() == "broken.ttl\n"
+
+
+class TestReplicaFanOut:
+    REPLICAS = ("http://replica-a:8890/sparql", "http://replica-b:8890/sparql")
+
+    def test_replica_failed_file_is_derived_from_endpoint(self) -> None:
+        assert replica_failed_file("logs/failed_queries.txt", "http://replica-a:8890/sparql") == Path(
+            "logs/failed_queries.replica_a_8890_sparql.txt",
+        )
+
+    def test_each_file_is_read_once_and_sent_to_every_replica(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        failed_file = Path(temp_dir) / "failed_queries.txt"
+        for i in range(3):
+            (sparql_dir / f"test{i}.sparql").write_text(f"INSERT DATA {{ <http://s> <http://p> {i} }}")
+        (sparql_dir / "broken.sparql").write_text("INSERT DATA {")
+
+        clients = {endpoint: MagicMock() for endpoint in self.REPLICAS}
+
+        def make_client(endpoint: str, **_kwargs: object) -> MagicMock:
+            client_cm = MagicMock()
+            client_cm.__enter__.return_value = clients[endpoint]
+            return client_cm
+
+        with (
+            patch("piccione.upload.on_triplestore.SPARQLClient", side_effect=make_client),
+            patch("piccione.upload.on_triplestore.read_query", wraps=lambda path: path.read_text()) as mock_read,
+        ):
+            upload_sparql_updates(list(self.REPLICAS), sparql_dir, failed_file=failed_file, show_progress=False)
+
+        assert mock_read.call_count == 4
+        for client in clients.values():
+            sent = sorted(call[0][0] for call in client.update.call_args_list)
+            assert sent == [f"INSERT DATA {{ <http://s> <http://p> {i} }}" for i in range(3)]
+        assert failed_file.read_text() == "broken.sparql\n"
+        assert replica_failed_file(failed_file, self.REPLICAS[1]).read_text() == "broken.sparql\n"
+
+    def test_added_replicas_use_separate_cache_keys(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        (sparql_dir / "test.sparql").write_text("INSERT DATA { <http://s> <http://p> 1 }")
+
+        # The primary keeps the key of single-endpoint runs; only added replicas get their own.
+        caches = {"processed_files": MagicMock(), f"processed_files:{self.REPLICAS[1]}": MagicMock()}
+        caches["processed_files"].__contains__ = MagicMock(return_value=True)
+        caches[f"processed_files:{self.REPLICAS[1]}"].__contains__ = MagicMock(return_value=False)
+
+        with (
+            patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls,
+            patch(
+                "piccione.upload.on_triplestore.CacheManager",
+                REDIS_KEY="processed_files",
+                side_effect=lambda **kw: caches[kw["key"]],
+            ),
+        ):
+            upload_sparql_updates(list(self.REPLICAS), sparql_dir, redis_host="localhost", show_progress=False)
+
+        assert [call[0][0] for call in mock_client_cls.call_args_list] == [self.REPLICAS[1]]
+        caches[f"processed_files:{self.REPLICAS[1]}"].add.assert_called_once_with("test.sparql")
+        caches["processed_files"].add.assert_not_called()
+
+    def test_slow_replica_does_not_stall_the_others(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        for i in range(5):
+            (sparql_dir / f"test{i}.sparql").write_text(f"INSERT DATA {{ <http://s> <http://p> {i} }}")
+
+        fast_done = threading.Event()
+        fast_sent: list[str] = []
+        slow_sent: list[str] = []
+
+        def fast_update(query: str) -> None:
+            fast_sent.append(query)
+            if len(fast_sent) == 5:
+                fast_done.set()
+
+        def slow_update(query: str) -> None:
+            assert fast_done.wait(timeout=5), "fast replica was stalled by the slow one"
+            slow_sent.append(query)
+
+        def make_client(endpoint: str, **_kwargs: object) -> MagicMock:
+            client_cm = MagicMock()
+            client_cm.__enter__.return_value.update.side_effect = (
+                fast_update if endpoint == self.REPLICAS[0] else slow_update
+            )
+            return client_cm
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient", side_effect=make_client):
+            upload_sparql_updates(list(self.REPLICAS), sparql_dir, show_progress=False, max_lag=1)
+
+        assert len(fast_sent) == 5
+        assert sorted(slow_sent) == sorted(fast_sent)
+
+
+class TestOrderingAndTimeouts:
+    def test_order_files_by_size(self, temp_dir: str) -> None:
+        for name, size in (("a.sparql", 20), ("b.sparql", 5), ("c.sparql", 50)):
+            (Path(temp_dir) / name).write_text("x" * size)
+        files = ["a.sparql", "b.sparql", "c.sparql"]
+
+        assert order_files(temp_dir, files, "discovered") == files
+        assert order_files(temp_dir, files, "largest") == ["c.sparql", "a.sparql", "b.sparql"]
+        assert order_files(temp_dir, files, "smallest") == ["b.sparql", "a.sparql", "c.sparql"]
+
+    def test_timeout_grows_with_payload_size(self) -> None:
+        policy = TimeoutPolicy(base=10, per_mb=30)
+        assert policy.for_payload("") == 10
+        assert policy.for_payload("x" * 524288) == 25
+
+    def test_timed_out_file_is_journaled_without_retry(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        failed_file = Path(temp_dir) / "failed_queries.txt"
+        timeout_file = Path(temp_dir) / "timed_out_queries.txt"
+        (sparql_dir / "slow.sparql").write_text("INSERT DATA { <http://s> <http://p> 1 }")
+        (sparql_dir / "fast.sparql").write_text("INSERT DATA { <http://s> <http://p> 2 }")
+
+        def update(query: str) -> None:
+            if query.endswith("1 }"):
+                msg = "Timeout error: read timed out"
+                raise EndpointError(msg)
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            mock_client = mock_client_cls.return_value.__enter__.return_value
+            mock_client.max_retries = 3
+            mock_client.update.side_effect = update
+            upload_sparql_updates(
+                SPARQL_ENDPOINT,
+                sparql_dir,
+                failed_file=failed_file,
+                timeout=5,
+                timeout_file=timeout_file,
+                show_progress=False,
+            )
+
+        assert mock_client.update.call_count == 2
+        assert mock_client.max_retries == 3
+        assert timeout_file.read_text() == "slow.sparql\n"
+        assert not failed_file.exists()
+
+    def test_other_errors_are_retried_after_first_attempt(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        (sparql_dir / "test.sparql").write_text("INSERT DATA { <http://s> <http://p> 1 }")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            mock_client = mock_client_cls.return_value.__enter__.return_value
+            mock_client.max_retries = 3
+            mock_client.update.side_effect = [EndpointError("HTTP error 503", status_code=503), None]
+            upload_sparql_updates(
+                SPARQL_ENDPOINT,
+                sparql_dir,
+                failed_file=Path(temp_dir) / "failed_queries.txt",
+                timeout=5,
+                show_progress=False,
+            )
+
+        assert mock_client.update.call_count == 2
+        assert mock_client.timeout == 5
+
+    def test_retry_that_times_out_is_journaled_as_timeout(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        failed_file = Path(temp_dir) / "failed_queries.txt"
+        timeout_file = Path(temp_dir) / "timed_out_queries.txt"
+        (sparql_dir / "test.sparql").write_text("INSERT DATA { <http://s> <http://p> 1 }")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            mock_client = mock_client_cls.return_value.__enter__.return_value
+            mock_client.max_retries = 3
+            mock_client.update.side_effect = [
+                EndpointError("HTTP error 503", status_code=503),
+                EndpointError("Timeout error: read timed out"),
+            ]
+            upload_sparql_updates(
+                SPARQL_ENDPOINT,
+                sparql_dir,
+                failed_file=failed_file,
+                timeout=5,
+                timeout_file=timeout_file,
+                show_progress=False,
+            )
+
+        assert mock_client.update.call_count == 2
+        assert mock_client.max_retries == 3
+        assert timeout_file.read_text() == "test.sparql\n"
+        assert not failed_file.exists()
+
+    def test_real_client_timeout_is_not_retried(self, slow_endpoint: str) -> None:
+        with SPARQLClient(slow_endpoint, max_retries=3) as client:
+            start = time.monotonic()
+            with pytest.raises(TimeoutError, match=r"^Timeout error"):
+                run_update(client, "INSERT DATA { <http://s> <http://p> 1 }", TimeoutPolicy(base=0.2))
+            elapsed = time.monotonic() - start
+
+            assert elapsed < 2
+            assert client.max_retries == 3
+
+    def test_workers_open_one_client_each(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        for i in range(6):
+            (sparql_dir / f"test{i}.sparql").write_text(f"INSERT DATA {{ <http://s> <http://p> {i} }}")
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            mock_client = mock_client_cls.return_value.__enter__.return_value
+            upload_sparql_updates(
+                SPARQL_ENDPOINT,
+                sparql_dir,
+                failed_file=Path(temp_dir) / "failed_queries.txt",
+                workers=3,
+                order="largest",
+                show_progress=False,
+            )
+
+        assert mock_client_cls.call_count == 3
+        assert mock_client.update.call_count == 6
+
+
+class TestWatchMode:
+    def test_uploads_existing_and_new_files_until_stopped(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        (sparql_dir / "existing.sparql").write_text("INSERT DATA { <http://s> <http://p> 1 }")
+
+        stop_event = threading.Event()
+        sent: list[str] = []
+        received = threading.Condition()
+
+        def update(query: str) -> None:
+            with received:
+                sent.append(query)
+                received.notify_all()
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient") as mock_client_cls:
+            mock_client_cls.return_value.__enter__.return_value.update.side_effect = update
+            watcher = threading.Thread(
+                target=watch_sparql_updates,
+                args=(SPARQL_ENDPOINT, sparql_dir),
+                kwargs={"stop_file": Path(temp_dir) / ".stop_upload", "poll_interval": 0.05, "stop_event": stop_event},
+            )
+            watcher.start()
+            with received:
+                assert received.wait_for(lambda: len(sent) == 1, timeout=5)
+            (sparql_dir / "new.sparql").write_text("INSERT DATA { <http://s> <http://p> 2 }")
+            with received:
+                assert received.wait_for(lambda: len(sent) == 2, timeout=5)
+            stop_event.set()
+            watcher.join(timeout=5)
+
+        assert not watcher.is_alive()
+        assert mock_client_cls.call_count == 1
+        assert sent == ["INSERT DATA { <http://s> <http://p> 1 }", "INSERT DATA { <http://s> <http://p> 2 }"]
+
+    def test_stop_file_ends_watch_mode(self, temp_dir: str) -> None:
+        sparql_dir = Path(temp_dir) / "sparql_files"
+        sparql_dir.mkdir(parents=True)
+        stop_file = Path(temp_dir) / ".stop_upload"
+
+        with patch("piccione.upload.on_triplestore.SPARQLClient"):
+            watcher = threading.Thread(
+                target=watch_sparql_updates,
+                args=(SPARQL_ENDPOINT, sparql_dir),
+                kwargs={"stop_file": stop_file, "poll_interval": 0.05},
+            )
+            watcher.start()
+            stop_file.write_text("")
+            watcher.join(timeout=5)
+
+        assert not watcher.is_alive()
@@ -0,0 +1,28 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from piccione.pagination import iter_windowed_pages
+
+
+class TestIterWindowedPages:
+    def test_stops_at_the_first_short_page(self) -> None:
+        entries = list(range(8))
+        requested: list[int] = []
+
+        def fetch_page(page: int) -> list[int]:
+            requested.append(page)
+            return entries[(page - 1) * 2 : page * 2]
+
+        assert list(iter_windowed_pages(fetch_page, 2, workers=2)) == entries
+        assert sorted(requested) == [1, 2, 3, 4, 5]
+
+    def test_short_first_page_needs_no_further_requests(self) -> None:
+        requested: list[int] = []
+
+        def fetch_page(page: int) -> list[int]:
+            requested.append(page)
+            return [1]
+
+        assert list(iter_windowed_pages(fetch_page, 2, workers=4)) == [1]
+        assert requested == [1]
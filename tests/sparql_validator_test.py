@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+from pathlib import Path
+
+import pytest
+
+from piccione.upload.sparql_validator import is_data_only, validate_file, validate_folder, validate_sparql_update
+
+
+class TestValidateSparqlUpdate:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            'INSERT DATA { GRAPH <http://g> { <http://s> <http://p> "o } with braces" . } }',
+            "PREFIX ex: <http://ex.org/>\nPREFIX : <http://d.org/>\nINSERT DATA { ex:a ex:b :c }",
+            "DELETE WHERE { ?s ?p ?o } ;\nINSERT DATA { <http://s> <http://p> 1 } ;",
+            "# a comment with an unbalanced {\nCLEAR GRAPH <http://g>",
+            "WITH <http://g> DELETE { ?s ?p ?o } INSERT { ?s ?p 2 } WHERE { ?s ?p ?o FILTER(?o<5 && ?o>1) }",
+            "BASE <http://base/> LOAD <http://x.org/data.nt> INTO GRAPH <http://g>",
+            'INSERT DATA { <http://s> <http://p> """multi\nline \' " literal""" }',
+            "PREFIX ex: <http://e/>\nCLEAR GRAPH ex:data",
+            "PREFIX ex: <http://e/>\nWITH ex:DATA DELETE { ?s ?p ?o } WHERE { ?s ?p ?o }",
+            "PREFIX : <http://e/>\nDROP GRAPH :data ;\ninsert data { :s :p :o }",
+            "DEFINE sql:log-enable 3 INSERT DATA { <http://s> <http://p> 1 }",
+            'DEFINE input:inference "r"\nPREFIX ex: <http://e/> DEFINE sql:log-enable 10\nDELETE WHERE { ?s ex:p ?o }',
+        ],
+    )
+    def test_accepts_valid_updates(self, query: str) -> None:
+        assert validate_sparql_update(query) is None
+
+    @pytest.mark.parametrize(
+        ("query", "error"),
+        [
+            ("INVALID SPARQL QUERY", "Line 1: expected an update operation, found 'INVALID'"),
+            ("SELECT * WHERE { ?s ?p ?o }", "Line 1: SELECT is a query form, not an update operation"),
+            (
+                "INSERT DATA {\n  <http://s> <http://p> <http://o> .\n",
+                "Unexpected end of input: '{' opened on line 1 is never closed",
+            ),
+            ('INSERT DATA { <http://s> <http://p> "o }', "Line 1: unterminated string literal"),
+            ("INSERT DATA { <http://s> <http://p> (<http://o>] }", "Line 1: ']' does not match '(' opened on line 1"),
+            ("INSERT DATA { <http://s> <http://p> <http://o> } }", "Line 1: unexpected '}'"),
+            ("INSERT DATA <http://g>", "Line 1: expected '{' after DATA, found '<http://g>'"),
+            ("DELETE data ex:g", "Line 1: expected '{' after DATA, found 'ex:g'"),
+            (
+                "INSERT DATA { <http://s> <http://p> 1 } ;\nDROPP GRAPH <http://g>",
+                "Line 2: expected an update operation, found 'DROPP'",
+            ),
+        ],
+    )
+    def test_rejects_invalid_updates(self, query: str, error: str) -> None:
+        assert validate_sparql_update(query) == error
+
+
+class TestIsDataOnly:
+    @pytest.mark.parametrize(
+        ("query", "expected"),
+        [
+            ("PREFIX ex: <http://e/>\nINSERT DATA { ex:s ex:p 1 } ;\ndelete data { ex:s ex:p 2 } ;", True),
+            ("DEFINE sql:log-enable 3 INSERT DATA { GRAPH <http://g> { <http://s> <http://p> 1 } }", True),
+            ("INSERT DATA { <http://s> <http://p> 1 } ;\nDELETE WHERE { ?s ?p ?o }", False),
+            ("WITH <http://g> DELETE { ?s ?p ?o } INSERT { ?s ?p 1 } WHERE { ?s ?p ?o }", False),
+            ("CLEAR GRAPH <http://g>", False),
+        ],
+    )
+    def test_detects_data_operations(self, query: str, *, expected: bool) -> None:
+        assert is_data_only(query) is expected
+
+
+class TestValidateFolder:
+    def test_reports_only_invalid_files(self, tmp_path: Path) -> None:
+        (tmp_path / "valid.sparql").write_text("INSERT DATA { <http://s> <http://p> <http://o> }")
+        (tmp_path / "invalid.sparql").write_text("INSERT DATA { <http://s> <http://p> <http://o>")
+        (tmp_path / "ignored.txt").write_text("not sparql")
+
+        assert validate_file(tmp_path / "valid.sparql") is None
+        assert validate_folder(tmp_path, workers=2) == {
+            "invalid.sparql": "Unexpected end of input: '{' opened on line 1 is never closed",
+        }
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+import hashlib
+import json
+from pathlib import Path
+
+from piccione.download.verify import ExpectedFile, sharepoint_manifest, verify_mirror
+
+
+def expected(content: bytes, *, with_md5: bool = True) -> ExpectedFile:
+    return {
+        "size": len(content),
+        "md5": hashlib.md5(content, usedforsecurity=False).hexdigest() if with_md5 else None,
+    }
+
+
+class TestVerifyMirror:
+    def test_reports_missing_corrupt_and_extra_files(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "good.bin").write_bytes(b"good content")
+        (tmp_path / "sub" / "flipped.bin").write_bytes(b"bad content!")
+        (tmp_path / "short.bin").write_bytes(b"short")
+        (tmp_path / "unknown.txt").write_bytes(b"?")
+        (tmp_path / ".figshare-digests.json").write_text("{}")
+        manifest = {
+            "good.bin": expected(b"good content"),
+            "sub/flipped.bin": expected(b"bad content?"),
+            "short.bin": expected(b"shorter"),
+            "gone.bin": expected(b"gone"),
+        }
+
+        report = verify_mirror(tmp_path, manifest, workers=2, ignored={".figshare-digests.json"})
+
+        assert report.checked == 4
+        assert report.ok == 1
+        assert report.missing == ["gone.bin"]
+        assert [item["path"] for item in report.corrupt] == ["short.bin", "sub/flipped.bin"]
+        assert report.corrupt[0]["reason"] == "size 5, expected 7"
+        assert report.extra == ["unknown.txt"]
+        assert not report.passed
+
+    def test_files_without_md5_are_checked_by_size(self, tmp_path: Path) -> None:
+        (tmp_path / "a.txt").write_bytes(b"abc")
+
+        report = verify_mirror(tmp_path, {"a.txt": expected(b"xyz", with_md5=False)}, workers=1)
+
+        assert report.ok == 1
+        assert report.passed
+
+
+class TestSharepointManifest:
+    def test_sizes_come_from_the_structure_file(self, tmp_path: Path) -> None:
+        structure = {
+            "structure": {
+                "Docs": {
+                    "_files": {"a.txt": {"size": 3, "modified": "2026-01-01T00:00:00Z", "etag": "1"}},
+                    "Sub": {"_files": {"b.txt": {"size": 5, "modified": "2026-01-01T00:00:00Z", "etag": "2"}}},
+                },
+            },
+            "folder_paths": {"Docs": "/sites/test/Docs"},
+        }
+        (tmp_path / "structure.json").write_text(json.dumps(structure))
+
+        assert sharepoint_manifest(tmp_path) == {
+            "Docs/a.txt": {"size": 3, "md5": None},
+            "Docs/Sub/b.txt": {"size": 5, "md5": None},
+        }
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2026 Arcangelo Massari <arcangelo.massari@unibo.it>
+#
+# SPDX-License-Identifier: ISC
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from piccione.upload.virtuoso import IsqlConnection, bulk_load, is_data_file, run_isql
+
+CONNECTION = IsqlConnection(password="secret", port=21111, server_folder="/database/data")  # noqa: S106
+
+
+def completed(stdout: str = "", returncode: int = 0) -> subprocess.CompletedProcess[str]:
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr="")
+
+
+class TestIsDataFile:
+    @pytest.mark.parametrize("name", ["data.nt", "data.nq.gz", "DATA.TTL", "dump.trig.bz2", "onto.rdf"])
+    def test_recognises_rdf_serialisations(self, name: str) -> None:
+        assert is_data_file(name)
+
+    @pytest.mark.parametrize("name", ["update.sparql", "notes.txt", "archive.gz"])
+    def test_ignores_other_files(self, name: str) -> None:
+        assert not is_data_file(name)
+
+
+class TestRunIsql:
+    def test_builds_command_line(self) -> None:
+        with patch("piccione.upload.virtuoso.subprocess.run", return_value=completed("done")) as mock_run:
+            assert run_isql(CONNECTION, "checkpoint;") == "done"
+
+        assert mock_run.call_args[0][0] == ["isql", "localhost:21111", "dba", "secret", "exec=checkpoint;"]
+
+    def test_raises_on_isql_error(self) -> None:
+        output = "*** Error 42000: [Virtuoso Driver][Virtuoso Server]SR008"
+        with (
+            patch("piccione.upload.virtuoso.subprocess.run", return_value=completed(output)),
+            pytest.raises(RuntimeError, match="SR008"),
+        ):
+            run_isql(CONNECTION, "bad;")
+
+
+class TestBulkLoad:
+    def test_registers_files_and_reports_failures(self, tmp_path: Path) -> None:
+        responses = [completed(), completed(), completed("ll_file\nVARCHAR\n/database/data/b'ad.nq\n\n1 Rows.")]
+
+        with patch("piccione.upload.virtuoso.subprocess.run", side_effect=responses) as mock_run:
+            failed = bulk_load(CONNECTION, tmp_path, ["good.nq", "b'ad.nq"], "http://g")
+
+        assert failed == {"b'ad.nq"}
+        register_sql = mock_run.call_args_list[0][0][0][-1]
+        assert "ld_add('/database/data/good.nq', 'http://g');" in register_sql
+        assert "ld_add('/database/data/b''ad.nq', 'http://g');" in register_sql
+        assert register_sql.startswith("exec=DELETE FROM DB.DBA.LOAD_LIST WHERE ll_file IN (")
+        assert mock_run.call_args_list[1][0][0][-1] == "exec=rdf_loader_run(); checkpoint;"